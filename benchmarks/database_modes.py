@@ -0,0 +1,123 @@
+"""Compares requests per second of the sync and async database modes.
+
+Starts the API once per database mode with uvicorn, then fires concurrent
+authenticated requests at a read endpoint and reports throughput and latency.
+
+Usage: python -m benchmarks.database_modes --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+
+async def wait_until_ready(client: httpx.AsyncClient) -> None:
+    """Waits for the API to start accepting requests."""
+    for _ in range(100):
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def get_access_token(client: httpx.AsyncClient) -> str:
+    """Creates a throwaway user and logs them in."""
+    email = f"benchmark-{uuid.uuid4().hex}@example.com"
+    await client.post(
+        "/user/", json={"name": "Benchmark", "email": email, "password": "benchmark"}
+    )
+    response = await client.post(
+        "/login", data={"username": email, "password": "benchmark"}
+    )
+    return response.json()["access_token"]
+
+
+async def run_load(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Sends requests with a fixed concurrency, returning elapsed time and latencies."""
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(path)
+
+    async def worker() -> None:
+        """Sends requests until the queue is empty."""
+        while not queue.empty():
+            request_path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(request_path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def benchmark_mode(mode: str, port: int, arguments: argparse.Namespace) -> None:
+    """Benchmarks the API running in one database mode."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(arguments.workers),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, "DATABASE_MODE": mode},
+    )
+    try:
+        limits = httpx.Limits(max_connections=arguments.concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            await wait_until_ready(client)
+            token = await get_access_token(client)
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            elapsed, latencies = await run_load(
+                client, arguments.path, arguments.requests, arguments.concurrency
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    print(
+        f"{mode:>5}: {arguments.requests / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    """Runs the benchmark for both database modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default="/product/all")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8100)
+    arguments = parser.parse_args()
+
+    for offset, mode in enumerate(["sync", "async"]):
+        asyncio.run(benchmark_mode(mode, arguments.port + offset, arguments))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Measures login latency while the catalogue is being read at the same time.
+
+Starts the API once with hashing inline and once with the password hashing
+pool, then mixes logins in with authenticated catalogue reads and reports the
+p99 latency of each kind of request.
+
+Usage: python -m benchmarks.login_latency --requests 2000 --login-share 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.database_modes import get_access_token, wait_until_ready
+
+
+def get_percentile(latencies: list[float], percentile: float) -> float:
+    """Gets a percentile of some latencies in milliseconds."""
+    latencies = sorted(latencies)
+    return latencies[max(int(len(latencies) * percentile) - 1, 0)] * 1000
+
+
+async def create_login_users(client: httpx.AsyncClient, count: int) -> list[dict]:
+    """Creates users to log in as during the benchmark."""
+    credentials = []
+    for _ in range(count):
+        email = f"benchmark-{uuid.uuid4().hex}@example.com"
+        await client.post(
+            "/user/",
+            json={"name": "Benchmark", "email": email, "password": "benchmark"},
+        )
+        credentials.append({"username": email, "password": "benchmark"})
+    return credentials
+
+
+async def run_mixed_load(
+    client: httpx.AsyncClient,
+    token: str,
+    credentials: list[dict],
+    arguments: argparse.Namespace,
+) -> dict[str, list[float]]:
+    """Sends a mix of logins and catalogue reads, returning latencies by kind."""
+    latencies = {"login": [], "catalogue": [], "rejected": []}
+    queue = asyncio.Queue()
+    for _ in range(arguments.requests):
+        queue.put_nowait(random.random() < arguments.login_share)
+
+    async def worker() -> None:
+        """Sends requests until the queue is empty."""
+        while not queue.empty():
+            is_login = queue.get_nowait()
+            start = time.perf_counter()
+            if is_login:
+                response = await client.post("/login", data=random.choice(credentials))
+            else:
+                response = await client.get(
+                    arguments.path, headers={"Authorization": f"Bearer {token}"}
+                )
+            latency = time.perf_counter() - start
+
+            if response.status_code == 503:
+                latencies["rejected"].append(latency)
+                continue
+            response.raise_for_status()
+            latencies["login" if is_login else "catalogue"].append(latency)
+
+    await asyncio.gather(*(worker() for _ in range(arguments.concurrency)))
+    return latencies
+
+
+async def benchmark_hashing(
+    label: str, hashing_workers: int, port: int, arguments: argparse.Namespace
+) -> None:
+    """Benchmarks the API with a given number of password hashing workers."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={
+            **os.environ,
+            "PASSWORD_HASHING_WORKERS": str(hashing_workers),
+            # every login comes from one address, so lift the login rate limits
+            "LOGIN_IP_BURST": str(arguments.requests),
+            "LOGIN_EMAIL_BURST": str(arguments.requests),
+        },
+    )
+    try:
+        limits = httpx.Limits(max_connections=arguments.concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            await wait_until_ready(client)
+            token = await get_access_token(client)
+            credentials = await create_login_users(client, arguments.users)
+            latencies = await run_mixed_load(client, token, credentials, arguments)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(
+        f"{label:>6}: login p50 {statistics.median(latencies['login']) * 1000:7.1f} ms  "
+        f"p99 {get_percentile(latencies['login'], 0.99):7.1f} ms  "
+        f"catalogue p99 {get_percentile(latencies['catalogue'], 0.99):7.1f} ms  "
+        f"rejected {len(latencies['rejected'])}"
+    )
+
+
+def main() -> None:
+    """Runs the benchmark with hashing inline and in the hashing pool."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default="/product/all")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--login-share", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--hashing-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8200)
+    arguments = parser.parse_args()
+
+    configurations = [("inline", 0), ("pool", arguments.hashing_workers)]
+    for offset, (label, hashing_workers) in enumerate(configurations):
+        asyncio.run(
+            benchmark_hashing(
+                label, hashing_workers, arguments.port + offset, arguments
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
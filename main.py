@@ -1,14 +1,86 @@
-from fastapi import FastAPI
+import asyncio
 
-from src.database.database_connection import Base, engine
-from src.routers import authentication, basket, payment, product, user
+from fastapi import FastAPI
 
-Base.metadata.create_all(bind=engine)
+from src.database.database_connection import (
+    DATABASE_MODE,
+    async_engine,
+    engine,
+    wait_for_database,
+)
+from src.database.migration import upgrade_database
+from src.monitoring.metrics import METRICS_ENABLED
+from src.monitoring.middleware import MetricsMiddleware, RequestScopeMiddleware
+from src.monitoring.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from src.monitoring.queries import instrument_engine, is_slow_query_logging_enabled
+from src.repository.hashing_pool import password_hashing_pool
+from src.repository.stock_shards import flush_hot_stock_periodically, hot_stock
+from src.routers import (
+    authentication,
+    basket,
+    monitoring,
+    order,
+    payment,
+    product,
+    user,
+)
+from src.routers.asynchronous import basket as async_basket
+from src.routers.asynchronous import order as async_order
+from src.routers.asynchronous import payment as async_payment
+from src.routers.asynchronous import product as async_product
+from src.routers.asynchronous import user as async_user
 
 app = FastAPI()
 
-app.include_router(product.router)
-app.include_router(user.router)
-app.include_router(basket.router)
-app.include_router(payment.router)
+if DATABASE_MODE == "async":
+    app.include_router(async_product.router)
+    app.include_router(async_user.router)
+    app.include_router(async_basket.router)
+    app.include_router(async_payment.router)
+    app.include_router(async_order.router)
+else:
+    app.include_router(product.router)
+    app.include_router(user.router)
+    app.include_router(basket.router)
+    app.include_router(payment.router)
+    app.include_router(order.router)
 app.include_router(authentication.router)
+app.include_router(monitoring.router)
+
+# nothing is timed, counted or profiled unless it is enabled
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(monitoring.metrics_router)
+if is_slow_query_logging_enabled():
+    app.add_middleware(RequestScopeMiddleware)
+if METRICS_ENABLED or is_slow_query_logging_enabled():
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+
+@app.on_event("startup")
+def prepare_database() -> None:
+    """Waits for the database to be reachable and migrates it to the latest schema."""
+    wait_for_database()
+    upgrade_database()
+
+
+@app.on_event("startup")
+async def start_hot_stock_flushing() -> None:
+    """Starts reconciling sharded hot product stock with the database."""
+    app.state.hot_stock_flushing = asyncio.create_task(flush_hot_stock_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_hot_stock_flushing() -> None:
+    """Stops reconciling hot product stock and hands back any unreserved stock."""
+    app.state.hot_stock_flushing.cancel()
+    hot_stock.flush()
+
+
+@app.on_event("shutdown")
+def stop_password_hashing_pool() -> None:
+    """Stops the password hashing worker processes."""
+    password_hashing_pool.shutdown()
@@ -0,0 +1,47 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+import src.database.models  # noqa: F401
+from src.database.database_connection import Base, engine
+
+config = context.config
+target_metadata = Base.metadata
+
+# only the alembic command line sets up logging, the app keeps its own
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+
+def run_migrations_offline() -> None:
+    """Writes the migrations out as SQL instead of running them."""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Runs the migrations on the connection given by the app, or a new one."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,66 @@
+"""add basket and catalogue indexes
+
+Makes (user_id, product_id) unique in baskets, merging any duplicate rows into
+one first, and adds indexes for looking up baskets by product and for the on
+sale and in stock catalogue filters.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2023-06-12 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE baskets
+        SET quantity = duplicates.total_quantity
+        FROM (
+            SELECT min(id) AS id, sum(quantity) AS total_quantity
+            FROM baskets
+            GROUP BY user_id, product_id
+            HAVING count(*) > 1
+        ) AS duplicates
+        WHERE baskets.id = duplicates.id
+        """)
+    op.execute("""
+        DELETE FROM baskets
+        WHERE id NOT IN (SELECT min(id) FROM baskets GROUP BY user_id, product_id)
+        """)
+    op.create_index(
+        "ux_baskets_user_id_product_id",
+        "baskets",
+        ["user_id", "product_id"],
+        unique=True,
+    )
+    op.create_index("ix_baskets_product_id", "baskets", ["product_id"])
+    op.create_index(
+        "ix_products_on_sale_id",
+        "products",
+        ["id"],
+        postgresql_where=sa.text("sale_percentage > 0"),
+    )
+    op.create_index(
+        "ix_products_in_stock_id",
+        "products",
+        ["id"],
+        postgresql_where=sa.text("stock > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_in_stock_id", table_name="products")
+    op.drop_index("ix_products_on_sale_id", table_name="products")
+    op.drop_index("ix_baskets_product_id", table_name="baskets")
+    op.drop_index("ux_baskets_user_id_product_id", table_name="baskets")
@@ -0,0 +1,52 @@
+"""add idempotency keys
+
+Adds the table storing the response of each checkout sent with an
+Idempotency-Key header, so retries of it get the same response back.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2023-06-19 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("request_hash", sa.String(), nullable=False),
+        sa.Column("response", postgresql.JSONB(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_idempotency_keys_user_id_key",
+        "idempotency_keys",
+        ["user_id", "key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_idempotency_keys_user_id_key", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,65 @@
+"""add orders
+
+Adds the orders written by checkout and the lines of each order, which keep
+the name and price of every product bought even after the product changes.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2023-06-26 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_cost", sa.Float(), nullable=False),
+        sa.Column("coupons_used", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_orders_user_id_created_at_id", "orders", ["user_id", "created_at", "id"]
+    )
+    op.create_table(
+        "order_lines",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=True),
+        sa.Column("product_name", sa.String(), nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total_cost", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="cascade"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="set null"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_order_lines_order_id", "order_lines", ["order_id"])
+    op.create_index("ix_order_lines_product_id", "order_lines", ["product_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_lines_product_id", table_name="order_lines")
+    op.drop_index("ix_order_lines_order_id", table_name="order_lines")
+    op.drop_table("order_lines")
+    op.drop_index("ix_orders_user_id_created_at_id", table_name="orders")
+    op.drop_table("orders")
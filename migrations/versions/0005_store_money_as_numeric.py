@@ -0,0 +1,54 @@
+"""store money as numeric
+
+Changes prices, totals and amounts spent from floats to numeric(12, 2), so
+amounts of money are stored exactly to the cent. Existing values are rounded
+to the cent, rounding halves away from zero.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2023-07-03 09:45:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_COLUMNS = [
+    ("products", "price", False),
+    ("users", "total_spent_overall", True),
+    ("orders", "total_cost", False),
+    ("order_lines", "unit_price", False),
+    ("order_lines", "total_cost", False),
+]
+
+
+def upgrade() -> None:
+    for table_name, column_name, nullable in MONEY_COLUMNS:
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=sa.Numeric(12, 2),
+            existing_type=sa.Float(),
+            existing_nullable=nullable,
+            postgresql_using=f"round({column_name}::numeric, 2)",
+        )
+
+
+def downgrade() -> None:
+    for table_name, column_name, nullable in MONEY_COLUMNS:
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=sa.Float(),
+            existing_type=sa.Numeric(12, 2),
+            existing_nullable=nullable,
+            postgresql_using=f"{column_name}::double precision",
+        )
@@ -0,0 +1,44 @@
+"""add product effective price
+
+Adds the sale price of each product as a stored generated column, so basket
+totals, checkout and sorting by sale price read it instead of working it out,
+and indexes it for sorting the catalogue.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2023-07-10 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column(
+            "effective_price",
+            sa.Numeric(12, 2),
+            sa.Computed(
+                "round(price * (100 - sale_percentage) / 100, 2)", persisted=True
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_products_effective_price_id", "products", ["effective_price", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_effective_price_id", table_name="products")
+    op.drop_column("products", "effective_price")
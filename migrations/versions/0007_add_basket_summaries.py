@@ -0,0 +1,46 @@
+"""add basket summaries
+
+Adds the item count and total cost of each user's basket, kept up to date as
+the basket changes, and fills it in for every basket that already has items.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2023-07-17 09:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "basket_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_cost", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("is_stale", sa.Boolean(), server_default="false", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute("""
+        INSERT INTO basket_summaries (user_id, total_items, total_cost)
+        SELECT baskets.user_id,
+            sum(baskets.quantity),
+            sum(products.effective_price * baskets.quantity)
+        FROM baskets
+        JOIN products ON products.id = baskets.product_id
+        GROUP BY baskets.user_id
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("basket_summaries")
@@ -0,0 +1,32 @@
+"""add products is_hot
+
+Adds the flag marking products whose stock is sharded in-process, which was only
+declared on the model and so never reached existing databases.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2023-07-24 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # databases migrated before the column left the baseline revision already have it
+    op.execute(
+        "ALTER TABLE products "
+        "ADD COLUMN IF NOT EXISTS is_hot BOOLEAN DEFAULT false NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "is_hot")
@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Adds the (price, id), (stock, id) and (user_id, id) indexes that product and
+basket pages are sorted and sought by, which were only declared on the models
+and so never reached existing databases.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2023-07-24 09:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # databases migrated before the indexes left the baseline revision already have them
+    op.create_index(
+        "ix_products_price_id", "products", ["price", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_products_stock_id", "products", ["stock", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_baskets_user_id_id", "baskets", ["user_id", "id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_baskets_user_id_id", table_name="baskets")
+    op.drop_index("ix_products_stock_id", table_name="products")
+    op.drop_index("ix_products_price_id", table_name="products")
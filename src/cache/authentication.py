@@ -0,0 +1,31 @@
+import hashlib
+import os
+
+from dotenv import load_dotenv
+
+from src.cache.backends import LRUCache
+
+load_dotenv()
+
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+
+def get_token_cache_key(access_token: str) -> str:
+    """Gets the cache key of a verified jwt access token."""
+    return f"token:{hashlib.sha256(access_token.encode()).hexdigest()}"
+
+
+def get_user_cache_key(id: int | str) -> str:
+    """Gets the cache key of the principal of a unique user."""
+    return f"user:{id}"
+
+
+def invalidate_cached_user(id: int) -> None:
+    """Removes the principal of a unique user from the cache."""
+    auth_cache.delete(get_user_cache_key(id))
+
+
+# Verified tokens are cached until they expire, while user principals only live for
+# AUTH_CACHE_TTL_SECONDS, which bounds how long other workers see a changed user.
+auth_cache = LRUCache(max_size=AUTH_CACHE_MAX_SIZE, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class CacheBackend(ABC):
+    """Abstract class for caches of JSON serializable values."""
+
+    @abstractmethod
+    def get(self, key: str) -> object | None:
+        """Gets a cached value, or None if it is missing or has expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: object, ttl_seconds: float | None = None) -> None:
+        """Caches a value until its time to live runs out."""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """Removes values from the cache."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every value from the cache."""
+
+
+class LRUCache(CacheBackend):
+    """In-process cache that evicts the least recently used values when full.
+
+    Each worker process has its own copy, so values deleted in one worker stay
+    cached in the others until their time to live runs out.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """Creates an empty cache."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> object | None:
+        """Gets a cached value, or None if it is missing or has expired."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: object, ttl_seconds: float | None = None) -> None:
+        """Caches a value, evicting the least recently used one if the cache is full."""
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        """Removes values from the cache."""
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every value from the cache."""
+        with self.lock:
+            self.entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache shared between workers, stored in Redis.
+
+    Any client with the get, set, delete and scan_iter methods of a redis.Redis
+    client can be used, such as a local fake in tests.
+    """
+
+    def __init__(
+        self, client: object, ttl_seconds: float, prefix: str = "cache:"
+    ) -> None:
+        """Creates a cache storing its values under a key prefix."""
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> object | None:
+        """Gets a cached value, or None if it is missing or has expired."""
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: object, ttl_seconds: float | None = None) -> None:
+        """Caches a value, letting Redis expire it."""
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+
+        self.client.set(
+            self.prefix + key,
+            json.dumps(value, default=str),
+            px=max(int(ttl_seconds * 1000), 1),
+        )
+
+    def delete(self, *keys: str) -> None:
+        """Removes values from the cache."""
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self) -> None:
+        """Removes every value under the cache's key prefix."""
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
@@ -0,0 +1,65 @@
+import json
+import os
+import uuid
+
+from dotenv import load_dotenv
+
+from src.cache.backends import CacheBackend, LRUCache, RedisCache
+
+load_dotenv()
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+CATALOGUE_VERSION_CACHE_KEY = "product:all:version"
+
+
+def create_cache_backend() -> CacheBackend:
+    """Creates the cache backend chosen by the CACHE_BACKEND setting."""
+    if CACHE_BACKEND == "redis":
+        import redis
+
+        return RedisCache(
+            client=redis.Redis.from_url(REDIS_URL), ttl_seconds=CACHE_TTL_SECONDS
+        )
+
+    return LRUCache(max_size=CACHE_MAX_SIZE, ttl_seconds=CACHE_TTL_SECONDS)
+
+
+def get_product_cache_key(id: int) -> str:
+    """Gets the cache key of a unique product."""
+    return f"product:{id}"
+
+
+def get_catalogue_cache_key(**query_parameters: object) -> str:
+    """Gets the cache key of a page of the catalogue.
+
+    Keys include the current catalogue version, so every cached page and filter
+    combination is invalidated at once by removing the version.
+    """
+    version = product_cache.get(CATALOGUE_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        product_cache.set(CATALOGUE_VERSION_CACHE_KEY, version)
+
+    return f"product:all:{version}:{json.dumps(query_parameters, sort_keys=True, default=str)}"
+
+
+def invalidate_cached_product(id: int | None = None) -> None:
+    """Removes a unique product and every page of the catalogue from the cache."""
+    if id is None:
+        product_cache.delete(CATALOGUE_VERSION_CACHE_KEY)
+    else:
+        product_cache.delete(CATALOGUE_VERSION_CACHE_KEY, get_product_cache_key(id))
+
+
+def invalidate_cached_products(ids: list[int]) -> None:
+    """Removes many products and every page of the catalogue from the cache at once."""
+    product_cache.delete(
+        CATALOGUE_VERSION_CACHE_KEY, *(get_product_cache_key(id) for id in ids)
+    )
+
+
+product_cache = create_cache_backend()
@@ -1,18 +1,55 @@
+import logging
 import os
 import time
 
-import psycopg2
 from dotenv import load_dotenv
-from psycopg2.extras import RealDictCursor
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from src.database.pool import TimedAsyncQueuePool, TimedQueuePool
+
 load_dotenv()
 
-engine = create_engine(os.getenv("SQLALCHEMY_DATABASE_URL"))
+logger = logging.getLogger(__name__)
+
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_SQLALCHEMY_DATABASE_URL",
+    make_url(os.getenv("SQLALCHEMY_DATABASE_URL")).set(drivername="postgresql+asyncpg"),
+)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_CONNECT_RETRIES = int(os.getenv("DB_CONNECT_RETRIES", "5"))
+DB_CONNECT_RETRY_SECONDS = float(os.getenv("DB_CONNECT_RETRY_SECONDS", "2"))
+
+pool_settings = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+engine = create_engine(
+    os.getenv("SQLALCHEMY_DATABASE_URL"), poolclass=TimedQueuePool, **pool_settings
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=TimedAsyncQueuePool, **pool_settings
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -25,19 +62,32 @@ def get_db() -> None:
         db.close()
 
 
-while True:
+async def get_async_db() -> AsyncSession:
+    """Creates a new async session to the database."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def is_database_ready() -> bool:
+    """Checks whether the database is accepting connections."""
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("PG_HOST"),
-            database=os.getenv("PG_DATABASE"),
-            user=os.getenv("PG_USERNAME"),
-            password=os.getenv("PG_PASSWORD"),
-            cursor_factory=RealDictCursor,
-        )
-        cursor = conn.cursor()
-        print("successfully connected to database")
-        break
-    except Exception as error:
-        print("connection to database failed")
-        print("Error: ", error)
-        time.sleep(2)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except OperationalError as error:
+        logger.warning("connection to database failed: %s", error)
+        return False
+    return True
+
+
+def wait_for_database(
+    retries: int = DB_CONNECT_RETRIES, retry_seconds: float = DB_CONNECT_RETRY_SECONDS
+) -> None:
+    """Waits for the database to accept connections, giving up after some retries."""
+    for attempt in range(retries):
+        if is_database_ready():
+            logger.info("successfully connected to database")
+            return
+        if attempt < retries - 1:
+            time.sleep(retry_seconds)
+
+    raise RuntimeError(f"could not connect to database after {retries} attempts")
@@ -0,0 +1,50 @@
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, func, inspect, select
+
+from src.database.database_connection import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "alembic.ini",
+)
+BASELINE_REVISION = "0001"
+MIGRATION_LOCK_ID = 4_720_113
+
+
+def get_alembic_config() -> Config:
+    """Gets the alembic config of the migrations in the repository."""
+    config = Config(ALEMBIC_CONFIG_PATH)
+    config.set_main_option(
+        "script_location",
+        os.path.join(os.path.dirname(ALEMBIC_CONFIG_PATH), "migrations"),
+    )
+    return config
+
+
+def upgrade_database(connectable: Engine = engine) -> None:
+    """Upgrades the database to the latest migration.
+
+    Databases whose tables were created before migrations existed are stamped
+    with the baseline revision first. An advisory lock stops several workers
+    starting at once from running the same migrations.
+    """
+    config = get_alembic_config()
+
+    with connectable.begin() as connection:
+        connection.execute(select(func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+        config.attributes["connection"] = connection
+
+        inspector = inspect(connection)
+        if inspector.has_table("products") and not inspector.has_table(
+            "alembic_version"
+        ):
+            logger.info("stamping existing tables with the baseline migration")
+            command.stamp(config, BASELINE_REVISION)
+
+        command.upgrade(config, "head")
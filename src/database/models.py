@@ -1,19 +1,48 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from src.database.database_connection import Base
+from src.database.money import MONEY
+
+EFFECTIVE_PRICE_EXPRESSION = "round(price * (100 - sale_percentage) / 100, 2)"
 
 
 class Products(Base):
     """Model for postgres table called 'products'."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_stock_id", "stock", "id"),
+        Index(
+            "ix_products_on_sale_id", "id", postgresql_where=text("sale_percentage > 0")
+        ),
+        Index("ix_products_in_stock_id", "id", postgresql_where=text("stock > 0")),
+        Index("ix_products_effective_price_id", "effective_price", "id"),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False)
     name = Column(String, unique=True, nullable=False)
-    price = Column(Float, nullable=False)
+    price = Column(MONEY, nullable=False)
     stock = Column(Integer, server_default="0")
     sale_percentage = Column(Integer, server_default="0")
+    # the sale price, rounded to the cent with halves rounded away from zero, kept
+    # current by the database whenever the price or sale percentage changes
+    effective_price = Column(
+        MONEY, Computed(EFFECTIVE_PRICE_EXPRESSION, persisted=True)
+    )
+    is_hot = Column(Boolean, nullable=False, server_default="false")
 
 
 class Users(Base):
@@ -25,7 +54,7 @@ class Users(Base):
     name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     hashed_password = Column(String, nullable=False)
-    total_spent_overall = Column(Float, server_default="0")
+    total_spent_overall = Column(MONEY, server_default="0")
     coupon_count = Column(Integer, server_default="0")
     basket_items = relationship("Baskets")
 
@@ -34,6 +63,11 @@ class Baskets(Base):
     """Model for postgrest table called 'baskets'."""
 
     __tablename__ = "baskets"
+    __table_args__ = (
+        Index("ix_baskets_user_id_id", "user_id", "id"),
+        Index("ux_baskets_user_id_product_id", "user_id", "product_id", unique=True),
+        Index("ix_baskets_product_id", "product_id"),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False)
     user_id = Column(
@@ -43,3 +77,79 @@ class Baskets(Base):
         Integer, ForeignKey("products.id", ondelete="cascade"), nullable=False
     )
     quantity = Column(Integer, nullable=False)
+
+
+class BasketSummaries(Base):
+    """Model for postgres table called 'basket_summaries'."""
+
+    __tablename__ = "basket_summaries"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="cascade"),
+        primary_key=True,
+        nullable=False,
+    )
+    total_items = Column(Integer, nullable=False, server_default="0")
+    total_cost = Column(MONEY, nullable=False, server_default="0")
+    is_stale = Column(Boolean, nullable=False, server_default="false")
+
+
+class IdempotencyKeys(Base):
+    """Model for postgres table called 'idempotency_keys'."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ux_idempotency_keys_user_id_key", "user_id", "key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="cascade"), nullable=False
+    )
+    key = Column(String, nullable=False)
+    request_hash = Column(String, nullable=False)
+    response = Column(JSONB)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+
+
+class Orders(Base):
+    """Model for postgres table called 'orders'."""
+
+    __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="cascade"), nullable=False
+    )
+    total_cost = Column(MONEY, nullable=False)
+    coupons_used = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+    lines = relationship("OrderLines")
+
+
+class OrderLines(Base):
+    """Model for postgres table called 'order_lines'."""
+
+    __tablename__ = "order_lines"
+    __table_args__ = (
+        Index("ix_order_lines_order_id", "order_id"),
+        Index("ix_order_lines_product_id", "product_id"),
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    order_id = Column(
+        Integer, ForeignKey("orders.id", ondelete="cascade"), nullable=False
+    )
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="set null"))
+    product_name = Column(String, nullable=False)
+    unit_price = Column(MONEY, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    total_cost = Column(MONEY, nullable=False)
@@ -0,0 +1,61 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Callable, Iterator
+
+from sqlalchemy import Numeric
+
+MONEY_PRECISION = 12
+MONEY_SCALE = 2
+CENT = Decimal(1).scaleb(-MONEY_SCALE)
+# the smallest amount with more integer digits than the column can store
+MONEY_LIMIT = Decimal(1).scaleb(MONEY_PRECISION - MONEY_SCALE)
+
+# amounts of money are stored exactly, to the cent, and read back as Decimals
+MONEY = Numeric(MONEY_PRECISION, MONEY_SCALE)
+
+
+def round_money(amount: Decimal | float | int | str) -> Decimal:
+    """Rounds an amount of money to the cent, rounding halves up.
+
+    Floats are converted through their shortest repr, so 0.1 becomes exactly 0.10
+    rather than the binary value closest to it.
+    """
+    amount = Decimal(str(amount))
+    if not amount.is_finite():
+        raise InvalidOperation(f"{amount} is not an amount of money")
+
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class MoneyAmount(Decimal):
+    """Pydantic type for an amount of money, rounded to the cent when parsed."""
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable]:
+        """Gets the validators pydantic runs to parse an amount of money."""
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict) -> None:
+        """Shows amounts of money as numbers in the OpenAPI schema."""
+        field_schema.update(type="number")
+
+    @classmethod
+    def validate(cls, value: object) -> Decimal:
+        """Parses an amount of money from a number or a string of digits.
+
+        Amounts are rejected if they are negative or do not fit in the money columns.
+        """
+        if isinstance(value, bool) or not isinstance(value, (Decimal, float, int, str)):
+            raise TypeError("value is not a valid amount of money")
+
+        try:
+            amount = round_money(value)
+        except InvalidOperation:
+            raise ValueError("value is not a valid amount of money")
+
+        if amount < 0:
+            raise ValueError("amount of money must not be negative")
+        if amount >= MONEY_LIMIT:
+            raise ValueError(f"amount of money must be less than {MONEY_LIMIT:f}")
+
+        return amount
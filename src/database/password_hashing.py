@@ -1,9 +1,23 @@
+import os
 from abc import ABC, abstractmethod
 
+from dotenv import load_dotenv
 from passlib.context import CryptContext
 
-pwd_cxt_bcrypt = CryptContext(schemes=["bcrypt"], deprecated="auto")
-pwd_cxt_scrypt = CryptContext(schemes=["scrypt"], deprecated="auto")
+load_dotenv()
+
+# the first scheme hashes new passwords, the others are only verified and are
+# rehashed with the first scheme on the next successful login
+PASSWORD_SCHEMES = os.getenv("PASSWORD_SCHEMES", "bcrypt,scrypt").split(",")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+SCRYPT_ROUNDS = int(os.getenv("SCRYPT_ROUNDS", "16"))
+
+pwd_cxt = CryptContext(
+    schemes=PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    scrypt__rounds=SCRYPT_ROUNDS,
+)
 
 
 class PasswordHasher(ABC):
@@ -14,24 +28,17 @@ class PasswordHasher(ABC):
         """Generates hashed version for given password."""
 
 
-class Bcrypt(PasswordHasher):
-    """Bcrypt password hasher."""
-
-    def get_hashed_password(self, password: str) -> str:
-        """Generates hashed password using bcrypt."""
-        hashed_password = pwd_cxt_bcrypt.hash(password)
-        return hashed_password
-
-
-class Scrypt(PasswordHasher):
-    """Scrypt password hasher."""
+class ConfiguredHasher(PasswordHasher):
+    """Password hasher using the first of the configured schemes."""
 
     def get_hashed_password(self, password: str) -> str:
-        """Generates hashed password using scrypt."""
-        hashed_password = pwd_cxt_scrypt.hash(password)
+        """Generates hashed password using the configured scheme and cost."""
+        hashed_password = pwd_cxt.hash(password)
         return hashed_password
 
 
-def verify_login_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies that two passwords are equal."""
-    return pwd_cxt_bcrypt.verify(plain_password, hashed_password)
+def verify_and_update_login_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verifies a password, rehashing it if its scheme or cost is out of date."""
+    return pwd_cxt.verify_and_update(plain_password, hashed_password)
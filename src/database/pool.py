@@ -0,0 +1,70 @@
+import threading
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolWaitTimes:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self) -> None:
+        """Creates empty wait time totals."""
+        self.lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Records how long a single checkout waited."""
+        with self.lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+
+class TimedPool:
+    """Mixin for queue pools that records how long each checkout waits."""
+
+    wait_times: PoolWaitTimes
+
+    def _do_get(self) -> object:
+        """Checks a connection out of the pool, timing how long it takes."""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_times.record(time.perf_counter() - start)
+
+
+class TimedQueuePool(TimedPool, QueuePool):
+    """Queue pool for the sync engine that records checkout wait times."""
+
+    wait_times = PoolWaitTimes()
+
+
+class TimedAsyncQueuePool(TimedPool, AsyncAdaptedQueuePool):
+    """Queue pool for the async engine that records checkout wait times."""
+
+    wait_times = PoolWaitTimes()
+
+
+def get_pool_metrics(pool: Pool) -> dict:
+    """Gets the current usage and checkout wait times of a connection pool."""
+    metrics = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+    if isinstance(pool, TimedPool):
+        wait_times = pool.wait_times
+        metrics.update(
+            {
+                "checkouts": wait_times.count,
+                "wait_seconds_total": wait_times.total_seconds,
+                "wait_seconds_max": wait_times.max_seconds,
+            }
+        )
+
+    return metrics
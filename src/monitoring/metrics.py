@@ -0,0 +1,148 @@
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> str:
+    """Formats label names and values as a Prometheus label set."""
+    labels = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(label_names, label_values)
+    )
+    return "{" + labels + "}" if labels else ""
+
+
+class Histogram:
+    """Thread-safe histogram of observations, kept separately for each set of labels.
+
+    Each worker process keeps its own histograms, so every worker has to be scraped
+    to see all of the requests served.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        """Creates a histogram with no observations."""
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series: dict[tuple[str, ...], list] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Records a single observation under a set of labels."""
+        bucket = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+
+            if bucket < len(self.buckets):
+                series[0][bucket] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self) -> list[str]:
+        """Renders the histogram in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bucket_label_names = self.label_names + ("le",)
+        with self.lock:
+            series = [
+                (label_values, list(bucket_counts), count, total)
+                for label_values, (bucket_counts, count, total) in self.series.items()
+            ]
+
+        for label_values, bucket_counts, count, total in sorted(series):
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative_count += bucket_count
+                bucket_labels = format_labels(
+                    bucket_label_names, label_values + (str(float(upper_bound)),)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative_count}")
+
+            bucket_labels = format_labels(bucket_label_names, label_values + ("+Inf",))
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+    def clear(self) -> None:
+        """Removes every observation."""
+        with self.lock:
+            self.series.clear()
+
+
+class QueryStats:
+    """Number of database queries run while serving a request, and how long they took."""
+
+    def __init__(self) -> None:
+        """Creates empty query totals."""
+        self.count = 0
+        self.seconds = 0.0
+
+
+# the totals are shared with threadpool workers, as they run in a copy of the context
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time taken to serve requests, by route template.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "Number of database queries run while serving a request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+request_query_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent waiting on database queries while serving a request.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+
+histograms = (request_duration, request_queries, request_query_duration)
+
+
+def render_metrics() -> str:
+    """Renders every metric in the Prometheus text format."""
+    lines = []
+    for histogram in histograms:
+        lines.extend(histogram.render())
+
+    return "\n".join(lines) + "\n"
+
+
+def clear_metrics() -> None:
+    """Removes the observations of every metric."""
+    for histogram in histograms:
+        histogram.clear()
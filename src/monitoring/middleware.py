@@ -0,0 +1,99 @@
+import time
+from contextvars import ContextVar
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.metrics import (
+    QueryStats,
+    current_query_stats,
+    request_duration,
+    request_queries,
+    request_query_duration,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+current_request_scope: ContextVar[Scope | None] = ContextVar(
+    "current_request_scope", default=None
+)
+
+
+def get_route_template(scope: Scope) -> str:
+    """Gets the path template of the route that served a request, such as '/user/{id}'.
+
+    Templates are used rather than paths so that every id shares one set of metrics.
+    """
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+
+    return UNMATCHED_ROUTE
+
+
+def get_current_route() -> str:
+    """Gets the method and route template of the request being served, if any."""
+    scope = current_request_scope.get()
+    if scope is None:
+        return "no request"
+
+    return f"{scope['method']} {get_route_template(scope)}"
+
+
+class RequestScopeMiddleware:
+    """ASGI middleware making the request being served known to code it calls."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wraps an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serves a request with its scope set as the current request scope."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_scope.reset(token)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency and database queries of each request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wraps an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serves a request, recording how long it took and which queries it ran."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            """Notes the status code of the response before sending it."""
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        query_stats = QueryStats()
+        token = current_query_stats.set(query_stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            current_query_stats.reset(token)
+
+            method = scope["method"]
+            route = get_route_template(scope)
+            request_duration.observe(duration, method, route, str(status_code))
+            request_queries.observe(query_stats.count, method, route)
+            request_query_duration.observe(query_stats.seconds, method, route)
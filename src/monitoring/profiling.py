@@ -0,0 +1,204 @@
+import contextvars
+import os
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from types import CodeType, FrameType
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.database_connection import SessionLocal
+from src.repository.authentication import (
+    get_credentials_exception,
+    get_current_user,
+    validate_user_as_admin,
+)
+from src.routers.schemas.authentication import UserPrincipal
+
+load_dotenv()
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "2"))
+
+PROFILE_HEADER = "X-Profile"
+PROFILED_STATUS_HEADER = "X-Profiled-Status"
+
+
+def get_short_filename(filename: str) -> str:
+    """Gets the path of a source file relative to the import path it was found on."""
+    prefixes = [path for path in sys.path if path and filename.startswith(path)]
+    if not prefixes:
+        return filename
+
+    return filename[len(max(prefixes, key=len)) :].lstrip(os.sep)
+
+
+class SamplingProfiler:
+    """Samples the stacks of the threads serving a request from a background thread.
+
+    Samples from the event loop are kept while it is running the frame the profiler
+    was started from, and samples from threadpool workers while they are running a
+    call in a copy of the request's context, so concurrent requests are left out.
+    """
+
+    def __init__(self, request_frame: FrameType, interval_seconds: float) -> None:
+        """Creates a profiler for the request running a frame."""
+        self.request_frame = request_frame
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.frame_labels: dict[CodeType, str] = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample_until_stopped, daemon=True)
+
+    def start(self) -> None:
+        """Starts sampling."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stops sampling, waiting for the sample being taken to finish."""
+        self.stopped.set()
+        self.thread.join()
+
+    def sample_until_stopped(self) -> None:
+        """Takes a sample of every thread after each interval until stopped."""
+        while not self.stopped.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != self.thread.ident:
+                    self.sample(frame)
+
+    def sample(self, frame: FrameType) -> None:
+        """Counts the stack of a thread, if the thread is serving the request."""
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+
+        request_frames = self.get_request_frames(frames)
+        if request_frames:
+            self.stacks[tuple(self.get_frame_label(f) for f in request_frames)] += 1
+
+    def get_request_frames(self, frames: list[FrameType]) -> list[FrameType]:
+        """Gets the frames of a stack run for the request, outermost first."""
+        if self.request_frame in frames:
+            return frames[frames.index(self.request_frame) :]
+
+        for index, frame in enumerate(frames):
+            for value in frame.f_locals.values():
+                if isinstance(value, contextvars.Context):
+                    if value.get(current_profiler) is self:
+                        return frames[index + 1 :]
+                    return []
+
+        return []
+
+    def get_frame_label(self, frame: FrameType) -> str:
+        """Gets the label of the function a frame is running, such as 'f (a/b.py:12)'."""
+        code = frame.f_code
+        label = self.frame_labels.get(code)
+        if label is None:
+            filename = get_short_filename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            label = self.frame_labels[code] = label.replace(";", ":")
+
+        return label
+
+    def render(self) -> str:
+        """Renders the samples as collapsed stacks, one line per distinct stack.
+
+        This is the input format of flamegraph.pl and of speedscope.
+        """
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+
+current_profiler: ContextVar[SamplingProfiler | None] = ContextVar(
+    "current_profiler", default=None
+)
+
+
+def is_profile_requested(scope: Scope) -> bool:
+    """Checks whether a request asks for its handler to be profiled."""
+    return Headers(scope=scope).get(PROFILE_HEADER, "").lower() == "true"
+
+
+def get_profiling_user(authorization: str | None) -> UserPrincipal:
+    """Verifies a request's access token belongs to an admin, who may profile requests."""
+    scheme, access_token = get_authorization_scheme_param(authorization)
+    if scheme.lower() != "bearer" or not access_token:
+        raise get_credentials_exception()
+
+    db = SessionLocal()
+    try:
+        current_user = get_current_user(access_token=access_token, db=db)
+    finally:
+        db.close()
+
+    validate_user_as_admin(current_user_email=current_user.email)
+    return current_user
+
+
+class ProfilingMiddleware:
+    """ASGI middleware replacing the response of a profiled request with its profile.
+
+    Admins ask for a profile with an 'X-Profile: true' header. The request is served
+    as usual, but its response is dropped and the collapsed stacks sampled while
+    serving it are returned instead, with the dropped status in a header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wraps an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serves a request, profiling it if an admin asked for it."""
+        if scope["type"] != "http" or not is_profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await run_in_threadpool(
+                get_profiling_user, Headers(scope=scope).get("Authorization")
+            )
+        except HTTPException as error:
+            response = JSONResponse(
+                {"detail": error.detail},
+                status_code=error.status_code,
+                headers=error.headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def drop_response(message: Message) -> None:
+            """Notes the status code of the response instead of sending it."""
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profiler = SamplingProfiler(
+            request_frame=sys._getframe(),
+            interval_seconds=PROFILING_INTERVAL_MS / 1000,
+        )
+        token = current_profiler.set(profiler)
+        profiler.start()
+        try:
+            await self.app(scope, receive, drop_response)
+        finally:
+            profiler.stop()
+            current_profiler.reset(token)
+
+        response = PlainTextResponse(
+            profiler.render(), headers={PROFILED_STATUS_HEADER: str(status_code)}
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,87 @@
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from src.monitoring.metrics import current_query_stats
+from src.monitoring.middleware import get_current_route
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# queries taking at least this long are logged, while a negative threshold logs none
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "-1"))
+
+QUERY_START_KEY = "query_start_time"
+
+
+def is_slow_query_logging_enabled() -> bool:
+    """Checks whether queries slower than the threshold are logged."""
+    return SLOW_QUERY_THRESHOLD_MS >= 0
+
+
+def describe_query_parameters(parameters: object) -> str:
+    """Describes the parameters of a query by name only, leaving out their values.
+
+    Values are never logged, as they include password hashes and email addresses.
+    """
+    if isinstance(parameters, dict):
+        return str(sorted(parameters))
+    if isinstance(parameters, (list, tuple)) and parameters:
+        if isinstance(parameters[0], dict):
+            return f"{len(parameters)} rows of {sorted(parameters[0])}"
+        return f"{len(parameters)} positional values"
+
+    return "none"
+
+
+def record_query_start(conn: Connection, *args: object) -> None:
+    """Notes when a query started, if it is counted for a request or may be logged."""
+    if current_query_stats.get() is not None or is_slow_query_logging_enabled():
+        conn.info[QUERY_START_KEY] = time.perf_counter()
+
+
+def record_query_end(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    *args: object,
+) -> None:
+    """Adds a finished query to the totals of the current request, logging it if slow.
+
+    A connection only runs one query at a time, so a single start time is kept on it.
+    """
+    start = conn.info.pop(QUERY_START_KEY, None)
+    if start is None:
+        return
+
+    duration = time.perf_counter() - start
+    query_stats = current_query_stats.get()
+    if query_stats is not None:
+        query_stats.count += 1
+        query_stats.seconds += duration
+
+    if is_slow_query_logging_enabled() and duration * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "slow query took %.1f ms serving %s: %s parameters: %s",
+            duration * 1000,
+            get_current_route(),
+            statement,
+            describe_query_parameters(parameters),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Times the queries an engine runs, for request metrics and the slow query log.
+
+    Async engines are instrumented through their 'sync_engine', whose events fire
+    in the same context as the coroutine awaiting the query.
+    """
+    if not event.contains(engine, "before_cursor_execute", record_query_start):
+        event.listen(engine, "before_cursor_execute", record_query_start)
+        event.listen(engine, "after_cursor_execute", record_query_end)
@@ -1,4 +1,5 @@
 import os
+import time
 from datetime import datetime, timedelta
 
 import jwt
@@ -6,15 +7,24 @@ from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import PyJWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database.database_connection import get_db
+from src.cache.authentication import (
+    auth_cache,
+    get_token_cache_key,
+    get_user_cache_key,
+)
+from src.database.database_connection import get_async_db, get_db
 from src.database.models import Users
-from src.routers.schemas.authentication import TokenData
+from src.routers.schemas.authentication import TokenData, UserPrincipal
 
 load_dotenv()
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = os.getenv("SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM")
+USER_ADMIN_EMAIL = os.getenv("USER_ADMIN_EMAIL")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
@@ -27,8 +37,8 @@ def create_encoded_jwt_access_token(data: dict) -> dict:
 
     encoded_jwt_token = jwt.encode(
         data_to_encode,
-        os.getenv("SECRET_KEY"),
-        algorithm=os.getenv("ALGORITHM"),
+        SECRET_KEY,
+        algorithm=ALGORITHM,
     )
 
     return encoded_jwt_token
@@ -36,12 +46,15 @@ def create_encoded_jwt_access_token(data: dict) -> dict:
 
 def verify_jwt_access_token(
     access_token: str, credentials_exception: Exception
-) -> None:
-    """Verifies the validity of a jwt access token."""
+) -> TokenData:
+    """Verifies the validity of a jwt access token, caching it until it expires."""
+    token_cache_key = get_token_cache_key(access_token)
+    token_data = auth_cache.get(token_cache_key)
+    if token_data is not None:
+        return token_data
+
     try:
-        payload = jwt.decode(
-            access_token, os.getenv("SECRET_KEY"), algorithms=[os.getenv("ALGORITHM")]
-        )
+        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("user_id")
 
         if user_id is None:
@@ -51,25 +64,64 @@ def verify_jwt_access_token(
     except PyJWTError:
         raise credentials_exception
 
+    if "exp" in payload:
+        auth_cache.set(
+            token_cache_key, token_data, ttl_seconds=payload["exp"] - time.time()
+        )
+
     return token_data
 
 
-def get_current_user(
-    access_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> Users:
-    """Verifies and gets the user currently logged in."""
-    credentials_exception = HTTPException(
+def get_credentials_exception() -> HTTPException:
+    """Creates the exception raised when a jwt access token is invalid."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def cache_user_principal(user: Users | None) -> UserPrincipal:
+    """Caches the principal of a verified user, rejecting tokens of deleted users."""
+    if user is None:
+        raise get_credentials_exception()
+
+    principal = UserPrincipal.from_orm(user)
+    auth_cache.set(get_user_cache_key(principal.id), principal)
+    return principal
+
+
+def get_current_user(
+    access_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> UserPrincipal:
+    """Verifies and gets the user currently logged in."""
+    token = verify_jwt_access_token(
+        access_token=access_token,
+        credentials_exception=get_credentials_exception(),
+    )
+    principal = auth_cache.get(get_user_cache_key(token.id))
+    if principal is None:
+        user = db.query(Users).filter(Users.id == token.id).first()
+        principal = cache_user_principal(user=user)
+
+    return principal
+
+
+async def get_current_user_async(
+    access_token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    """Verifies and gets the user currently logged in using an async session."""
     token = verify_jwt_access_token(
         access_token=access_token,
-        credentials_exception=credentials_exception,
+        credentials_exception=get_credentials_exception(),
     )
-    user = db.query(Users).filter(Users.id == token.id).first()
-    return user
+    principal = auth_cache.get(get_user_cache_key(token.id))
+    if principal is None:
+        user = await db.get(Users, int(token.id))
+        principal = cache_user_principal(user=user)
+
+    return principal
 
 
 def validate_correct_user(id: int, current_user_id: int) -> None:
@@ -83,16 +135,16 @@ def validate_correct_user(id: int, current_user_id: int) -> None:
 
 def validate_user_as_admin(current_user_email: str) -> None:
     """Validates whether a user is authorized correctly."""
-    if current_user_email != os.getenv("USER_ADMIN_EMAIL"):
+    if current_user_email != USER_ADMIN_EMAIL:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="not authorized to perform this requested action",
         )
 
 
-def validate_correct_user_or_admin(id: int, current_user: Users) -> None:
+def validate_correct_user_or_admin(id: int, current_user: UserPrincipal) -> None:
     """Validates whether a user is authorized correctly."""
-    if (id != current_user.id) & (current_user.email != os.getenv("USER_ADMIN_EMAIL")):
+    if (id != current_user.id) & (current_user.email != USER_ADMIN_EMAIL):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="not authorized to perform this requested action",
@@ -1,6 +1,32 @@
+from decimal import Decimal
+
 from fastapi import HTTPException, status
+from sqlalchemy import (
+    Delete,
+    Insert,
+    Row,
+    ScalarSelect,
+    Select,
+    Update,
+    delete,
+    false,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database.models import Baskets, BasketSummaries, Products
+from src.routers.schemas.basket import BasketCreate
+
+discounted_product_price = Products.effective_price
+basket_item_cost = discounted_product_price * Baskets.quantity
 
-from src.database.models import Baskets
+# product columns that change what basket items cost when they are updated
+BASKET_COST_COLUMNS = {"price", "sale_percentage"}
 
 
 def does_product_exist_in_user_basket(basket_product: Baskets) -> None:
@@ -19,3 +45,310 @@ def is_basket_empty(basket_products: list) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail="user has no basket items!",
         )
+
+
+def upsert_user_basket_item(user_id: int, new_item: BasketCreate) -> Insert:
+    """Builds the statement adding a quantity of a product to a user's basket.
+
+    A new basket item is inserted, or the quantity of the existing one for the
+    product is increased, in a single statement keyed on (user_id, product_id),
+    so concurrent adds of the same product can never create duplicate items.
+    """
+    statement = insert(Baskets).values(
+        user_id=user_id,
+        product_id=new_item.product_id,
+        quantity=new_item.quantity,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[Baskets.user_id, Baskets.product_id],
+        set_={"quantity": Baskets.quantity + statement.excluded.quantity},
+    ).returning(Baskets.user_id, Baskets.product_id, Baskets.quantity)
+
+
+def select_effective_price(product_id: int) -> ScalarSelect:
+    """Builds the subquery getting a product's sale price."""
+    return (
+        select(Products.effective_price)
+        .where(Products.id == product_id)
+        .scalar_subquery()
+    )
+
+
+def add_product_to_basket_summary(
+    user_id: int, product_id: int, quantity: int
+) -> Insert:
+    """Builds the statement adding a quantity of a product to a user's basket summary."""
+    statement = insert(BasketSummaries).values(
+        user_id=user_id,
+        total_items=quantity,
+        total_cost=select_effective_price(product_id=product_id) * quantity,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[BasketSummaries.user_id],
+        set_={
+            "total_items": BasketSummaries.total_items + statement.excluded.total_items,
+            "total_cost": BasketSummaries.total_cost + statement.excluded.total_cost,
+        },
+    )
+
+
+def mark_basket_summary_stale(user_id: int) -> Insert:
+    """Builds the statement marking a user's basket summary stale, creating it if missing."""
+    statement = insert(BasketSummaries).values(user_id=user_id, is_stale=True)
+    return statement.on_conflict_do_update(
+        index_elements=[BasketSummaries.user_id],
+        set_={"is_stale": statement.excluded.is_stale},
+    )
+
+
+def remove_from_basket_summary(
+    user_id: int, total_items: int, total_cost: Decimal | ScalarSelect
+) -> Update:
+    """Builds the statement taking items and their cost off a user's basket summary."""
+    return (
+        update(BasketSummaries)
+        .where(BasketSummaries.user_id == user_id)
+        .values(
+            total_items=BasketSummaries.total_items - total_items,
+            total_cost=BasketSummaries.total_cost - total_cost,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def mark_basket_summaries_stale(product_ids: list[int]) -> Update:
+    """Builds the statement marking stale the summary of every basket holding a product."""
+    return (
+        update(BasketSummaries)
+        .where(
+            BasketSummaries.user_id.in_(
+                select(Baskets.user_id).where(Baskets.product_id.in_(product_ids))
+            )
+        )
+        .values(is_stale=True)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def does_change_basket_costs(new_values: dict) -> bool:
+    """Checks whether an update to a product changes what its basket items cost."""
+    return not BASKET_COST_COLUMNS.isdisjoint(new_values)
+
+
+def select_basket_summary(user_id: int) -> Select:
+    """Builds the query for a user's basket summary by its primary key."""
+    return select(BasketSummaries).where(BasketSummaries.user_id == user_id)
+
+
+def upsert_basket_summary_totals(user_id: int) -> Insert:
+    """Builds the statement working out a user's basket summary from their basket items."""
+    totals = (
+        select(
+            literal(user_id),
+            func.coalesce(func.sum(Baskets.quantity), 0),
+            func.coalesce(func.sum(basket_item_cost), 0),
+            false(),
+        )
+        .select_from(Baskets)
+        .join(Products, Products.id == Baskets.product_id)
+        .where(Baskets.user_id == user_id)
+    )
+    statement = insert(BasketSummaries).from_select(
+        ["user_id", "total_items", "total_cost", "is_stale"], totals
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[BasketSummaries.user_id],
+        set_={
+            "total_items": statement.excluded.total_items,
+            "total_cost": statement.excluded.total_cost,
+            "is_stale": statement.excluded.is_stale,
+        },
+    ).returning(
+        BasketSummaries.user_id, BasketSummaries.total_items, BasketSummaries.total_cost
+    )
+
+
+def update_basket_summary_totals(db: Session, user_id: int) -> Row:
+    """Works out a user's basket summary again in the current transaction.
+
+    The summary is locked before the totals are read, so a price change marking it
+    stale meanwhile has to wait and marks it stale again after the new totals.
+    """
+    db.execute(select_basket_summary(user_id=user_id).with_for_update())
+    return db.execute(upsert_basket_summary_totals(user_id=user_id)).one()
+
+
+async def update_basket_summary_totals_async(db: AsyncSession, user_id: int) -> Row:
+    """Works out a user's basket summary again using an async session."""
+    await db.execute(select_basket_summary(user_id=user_id).with_for_update())
+    result = await db.execute(upsert_basket_summary_totals(user_id=user_id))
+    return result.one()
+
+
+def get_basket_summary(db: Session, user_id: int) -> BasketSummaries | Row:
+    """Gets a user's basket summary, working it out again if it is stale or missing."""
+    basket_summary = db.scalar(select_basket_summary(user_id=user_id))
+    if basket_summary is not None and not basket_summary.is_stale:
+        return basket_summary
+
+    basket_summary = update_basket_summary_totals(db=db, user_id=user_id)
+    db.commit()
+    return basket_summary
+
+
+async def get_basket_summary_async(
+    db: AsyncSession, user_id: int
+) -> BasketSummaries | Row:
+    """Gets a user's basket summary using an async session."""
+    basket_summary = await db.scalar(select_basket_summary(user_id=user_id))
+    if basket_summary is not None and not basket_summary.is_stale:
+        return basket_summary
+
+    basket_summary = await update_basket_summary_totals_async(db=db, user_id=user_id)
+    await db.commit()
+    return basket_summary
+
+
+def add_product_to_user_basket_summary(
+    user_id: int, new_item: BasketCreate, is_hot_product: bool
+) -> Insert:
+    """Builds the statement recording a basket add in the user's basket summary.
+
+    Stock of other products is reserved by locking their row in the same
+    transaction, so a concurrent price or sale change waits for the add to commit
+    and then marks the summary stale. Hot products reserve stock without touching
+    their row, so their price is not added in and the summary is marked stale.
+    """
+    if is_hot_product:
+        return mark_basket_summary_stale(user_id=user_id)
+
+    return add_product_to_basket_summary(
+        user_id=user_id, product_id=new_item.product_id, quantity=new_item.quantity
+    )
+
+
+def add_item_to_user_basket(
+    db: Session, user_id: int, new_item: BasketCreate, is_hot_product: bool = False
+) -> Row:
+    """Adds a quantity of a product to a user's basket and its summary, then commits."""
+    basket_item = db.execute(
+        upsert_user_basket_item(user_id=user_id, new_item=new_item)
+    ).one()
+    db.execute(
+        add_product_to_user_basket_summary(
+            user_id=user_id, new_item=new_item, is_hot_product=is_hot_product
+        )
+    )
+    db.commit()
+    return basket_item
+
+
+async def add_item_to_user_basket_async(
+    db: AsyncSession,
+    user_id: int,
+    new_item: BasketCreate,
+    is_hot_product: bool = False,
+) -> Row:
+    """Adds a quantity of a product to a user's basket using an async session."""
+    result = await db.execute(
+        upsert_user_basket_item(user_id=user_id, new_item=new_item)
+    )
+    basket_item = result.one()
+    await db.execute(
+        add_product_to_user_basket_summary(
+            user_id=user_id, new_item=new_item, is_hot_product=is_hot_product
+        )
+    )
+    await db.commit()
+    return basket_item
+
+
+def delete_user_basket_item_returning(user_id: int, product_id: int) -> Delete:
+    """Builds the statement removing a product from a user's basket, returning its quantity."""
+    return (
+        delete(Baskets)
+        .where(Baskets.user_id == user_id)
+        .where(Baskets.product_id == product_id)
+        .returning(Baskets.quantity)
+    )
+
+
+def remove_product_from_basket_summary(
+    user_id: int, product_id: int, quantity: int
+) -> Update:
+    """Builds the statement taking a quantity of a product off a user's basket summary."""
+    return remove_from_basket_summary(
+        user_id=user_id,
+        total_items=quantity,
+        total_cost=select_effective_price(product_id=product_id) * quantity,
+    )
+
+
+def remove_item_from_user_basket(db: Session, user_id: int, product_id: int) -> None:
+    """Removes a product from a user's basket and its summary, then commits.
+
+    The product is not locked, as any price change since the item was added has
+    already marked the summary stale, so taking off the current price is safe.
+    """
+    quantity = db.scalar(
+        delete_user_basket_item_returning(user_id=user_id, product_id=product_id)
+    )
+    does_product_exist_in_user_basket(basket_product=quantity)
+
+    db.execute(
+        remove_product_from_basket_summary(
+            user_id=user_id, product_id=product_id, quantity=quantity
+        )
+    )
+    db.commit()
+
+
+async def remove_item_from_user_basket_async(
+    db: AsyncSession, user_id: int, product_id: int
+) -> None:
+    """Removes a product from a user's basket and its summary using an async session."""
+    quantity = await db.scalar(
+        delete_user_basket_item_returning(user_id=user_id, product_id=product_id)
+    )
+    does_product_exist_in_user_basket(basket_product=quantity)
+
+    await db.execute(
+        remove_product_from_basket_summary(
+            user_id=user_id, product_id=product_id, quantity=quantity
+        )
+    )
+    await db.commit()
+
+
+def select_user_basket_items(user_id: int) -> Select:
+    """Builds the query for the names, quantities and costs of a user's basket items."""
+    return (
+        select(Products.name, Baskets.quantity, basket_item_cost.label("cost"))
+        .join(Products, Products.id == Baskets.product_id)
+        .where(Baskets.user_id == user_id)
+        .order_by(Baskets.id)
+    )
+
+
+def summarise_user_basket(user_id: int, basket_items: list) -> dict:
+    """Summarises the items and discounted totals of a user's basket."""
+    return {
+        "user_id": user_id,
+        "items": [
+            {"product": item.name, "quantity": item.quantity} for item in basket_items
+        ],
+        "total_items_in_basket": sum(item.quantity for item in basket_items),
+        "total_cost_of_basket": sum(item.cost for item in basket_items),
+    }
+
+
+def get_user_basket_summary(db: Session, user_id: int) -> dict:
+    """Gets the items and discounted totals of a user's basket in a single query."""
+    basket_items = db.execute(select_user_basket_items(user_id=user_id)).all()
+    return summarise_user_basket(user_id=user_id, basket_items=basket_items)
+
+
+async def get_user_basket_summary_async(db: AsyncSession, user_id: int) -> dict:
+    """Gets the items and discounted totals of a user's basket using an async session."""
+    result = await db.execute(select_user_basket_items(user_id=user_id))
+    return summarise_user_basket(user_id=user_id, basket_items=result.all())
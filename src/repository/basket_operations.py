@@ -0,0 +1,276 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Delete, Insert, Select, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database.models import Baskets, Products
+from src.repository.basket import (
+    does_product_exist_in_user_basket,
+    mark_basket_summary_stale,
+    update_basket_summary_totals,
+    update_basket_summary_totals_async,
+)
+from src.repository.product import (
+    does_product_exist_in_database,
+    is_there_enough_stock,
+    update_products_from_values,
+)
+from src.repository.stock_shards import ShardedStockCounter, hot_stock
+from src.routers.schemas.basket import BasketOperation, BasketOperationType
+
+
+def select_product_stock_for_update(product_ids: list[int]) -> Select:
+    """Builds the query locking products, in id order, and getting their stock."""
+    return (
+        select(Products.id, Products.stock)
+        .where(Products.id.in_(product_ids))
+        .order_by(Products.id)
+        .with_for_update()
+    )
+
+
+def select_basket_quantities_for_update(user_id: int, product_ids: list[int]) -> Select:
+    """Builds the query locking a user's basket items for some products."""
+    return (
+        select(Baskets.product_id, Baskets.quantity)
+        .where(Baskets.user_id == user_id)
+        .where(Baskets.product_id.in_(product_ids))
+        .with_for_update()
+    )
+
+
+def plan_basket_operations(
+    operations: list[BasketOperation], basket_quantities: dict[int, int]
+) -> tuple[dict[int, int], dict[int, int]]:
+    """Works out the final quantity of each product and the stock the changes take.
+
+    Operations are applied in order. As with removing a single item, removing an
+    item or lowering its quantity does not hand its stock back.
+    """
+    quantities = dict(basket_quantities)
+    stock_needed = {}
+
+    for operation in operations:
+        current_quantity = quantities.get(operation.product_id, 0)
+
+        if operation.operation == BasketOperationType.remove:
+            does_product_exist_in_user_basket(basket_product=current_quantity)
+            new_quantity = 0
+        elif operation.operation == BasketOperationType.add:
+            new_quantity = current_quantity + operation.quantity
+        else:
+            new_quantity = operation.quantity
+
+        quantities[operation.product_id] = new_quantity
+        stock_needed[operation.product_id] = stock_needed.get(
+            operation.product_id, 0
+        ) + max(new_quantity - current_quantity, 0)
+
+    return quantities, stock_needed
+
+
+def validate_stock_needed(
+    product_stock: dict[int, int], stock_needed: dict[int, int]
+) -> None:
+    """Checks every product with stock taken exists and has enough stock left."""
+    for product_id, quantity in stock_needed.items():
+        if quantity == 0:
+            continue
+        does_product_exist_in_database(product=product_stock.get(product_id))
+        is_there_enough_stock(
+            quantity_purchased=quantity, amount_of_stock=product_stock[product_id]
+        )
+
+
+def reserve_hot_stock(
+    hot_counters: dict[int, ShardedStockCounter], stock_needed: dict[int, int]
+) -> list[tuple[ShardedStockCounter, int]]:
+    """Reserves stock of hot products, releasing it all again if any is short."""
+    reservations = []
+    try:
+        for product_id, counter in hot_counters.items():
+            if stock_needed.get(product_id, 0) > 0:
+                counter.reserve(quantity=stock_needed[product_id])
+                reservations.append((counter, stock_needed[product_id]))
+    except Exception:
+        release_hot_stock(reservations=reservations)
+        raise
+
+    return reservations
+
+
+def release_hot_stock(reservations: list[tuple[ShardedStockCounter, int]]) -> None:
+    """Hands reserved stock of hot products back to their counters."""
+    for counter, quantity in reservations:
+        counter.release(quantity=quantity)
+
+
+def upsert_basket_item_quantities() -> Insert:
+    """Builds the statement setting the quantities of many basket items at once."""
+    statement = insert(Baskets)
+    return statement.on_conflict_do_update(
+        index_elements=[Baskets.user_id, Baskets.product_id],
+        set_={"quantity": statement.excluded.quantity},
+    )
+
+
+def delete_user_basket_items(user_id: int, product_ids: list[int]) -> Delete:
+    """Builds the statement removing some products from a user's basket."""
+    return (
+        delete(Baskets)
+        .where(Baskets.user_id == user_id)
+        .where(Baskets.product_id.in_(product_ids))
+    )
+
+
+def get_basket_item_writes(
+    user_id: int, quantities: dict[int, int]
+) -> tuple[list[dict], list[int]]:
+    """Splits the final quantities into basket items to upsert and products to remove."""
+    basket_items = [
+        {"user_id": user_id, "product_id": product_id, "quantity": quantity}
+        for product_id, quantity in quantities.items()
+        if quantity > 0
+    ]
+    removed_product_ids = [
+        product_id for product_id, quantity in quantities.items() if quantity == 0
+    ]
+    return basket_items, removed_product_ids
+
+
+def get_product_stock_updates(
+    product_stock: dict[int, int], stock_needed: dict[int, int]
+) -> list[tuple[int, int]]:
+    """Works out the stock left for each locked product that stock is taken from."""
+    return [
+        (product_id, product_stock[product_id] - quantity)
+        for product_id, quantity in stock_needed.items()
+        if quantity > 0 and product_id in product_stock
+    ]
+
+
+def apply_basket_operations(
+    db: Session, user_id: int, operations: list[BasketOperation]
+) -> None:
+    """Applies changes to a user's basket in a single transaction.
+
+    Products and basket items are locked and read with one query each, then the
+    new stock, upserted items and removed items are written with one statement
+    each, and the basket summary is worked out again from the new items. Hot
+    products are left unlocked and reserve from their sharded counters instead,
+    so a price change could miss their new items, and the summary is marked
+    stale rather than worked out with their prices.
+    """
+    product_ids = sorted({operation.product_id for operation in operations})
+    hot_counters = {
+        product_id: counter
+        for product_id in product_ids
+        if (counter := hot_stock.get_counter(product_id=product_id)) is not None
+    }
+
+    locked_product_ids = [
+        product_id for product_id in product_ids if product_id not in hot_counters
+    ]
+
+    product_stock = dict(
+        db.execute(select_product_stock_for_update(locked_product_ids)).all()
+    )
+    basket_quantities = dict(
+        db.execute(select_basket_quantities_for_update(user_id, product_ids)).all()
+    )
+
+    quantities, stock_needed = plan_basket_operations(operations, basket_quantities)
+    validate_stock_needed(
+        product_stock=product_stock,
+        stock_needed={
+            product_id: stock_needed[product_id] for product_id in locked_product_ids
+        },
+    )
+    reservations = reserve_hot_stock(
+        hot_counters=hot_counters, stock_needed=stock_needed
+    )
+
+    try:
+        product_stock_updates = get_product_stock_updates(product_stock, stock_needed)
+        if product_stock_updates:
+            db.execute(
+                update_products_from_values(Products.stock, product_stock_updates)
+            )
+
+        basket_items, removed_product_ids = get_basket_item_writes(
+            user_id=user_id, quantities=quantities
+        )
+        if basket_items:
+            db.execute(upsert_basket_item_quantities(), basket_items)
+        if removed_product_ids:
+            db.execute(delete_user_basket_items(user_id, removed_product_ids))
+        if hot_counters:
+            db.execute(mark_basket_summary_stale(user_id=user_id))
+        else:
+            update_basket_summary_totals(db=db, user_id=user_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        release_hot_stock(reservations=reservations)
+        raise
+
+
+async def apply_basket_operations_async(
+    db: AsyncSession, user_id: int, operations: list[BasketOperation]
+) -> None:
+    """Applies changes to a user's basket in a single transaction using an async session."""
+    product_ids = sorted({operation.product_id for operation in operations})
+    hot_counters = {
+        product_id: counter
+        for product_id in product_ids
+        if (counter := hot_stock.get_counter(product_id=product_id)) is not None
+    }
+
+    locked_product_ids = [
+        product_id for product_id in product_ids if product_id not in hot_counters
+    ]
+
+    product_stock_result = await db.execute(
+        select_product_stock_for_update(locked_product_ids)
+    )
+    product_stock = dict(product_stock_result.all())
+    basket_quantities_result = await db.execute(
+        select_basket_quantities_for_update(user_id, product_ids)
+    )
+    basket_quantities = dict(basket_quantities_result.all())
+
+    quantities, stock_needed = plan_basket_operations(operations, basket_quantities)
+    validate_stock_needed(
+        product_stock=product_stock,
+        stock_needed={
+            product_id: stock_needed[product_id] for product_id in locked_product_ids
+        },
+    )
+    reservations = await run_in_threadpool(
+        reserve_hot_stock, hot_counters=hot_counters, stock_needed=stock_needed
+    )
+
+    try:
+        product_stock_updates = get_product_stock_updates(product_stock, stock_needed)
+        if product_stock_updates:
+            await db.execute(
+                update_products_from_values(Products.stock, product_stock_updates)
+            )
+
+        basket_items, removed_product_ids = get_basket_item_writes(
+            user_id=user_id, quantities=quantities
+        )
+        if basket_items:
+            await db.execute(upsert_basket_item_quantities(), basket_items)
+        if removed_product_ids:
+            await db.execute(delete_user_basket_items(user_id, removed_product_ids))
+        if hot_counters:
+            await db.execute(mark_basket_summary_stale(user_id=user_id))
+        else:
+            await update_basket_summary_totals_async(db=db, user_id=user_id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        release_hot_stock(reservations=reservations)
+        raise
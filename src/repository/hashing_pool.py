@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+load_dotenv()
+
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASHING_QUEUE_SIZE = int(
+    os.getenv("PASSWORD_HASHING_QUEUE_SIZE", str(max(PASSWORD_HASHING_WORKERS, 1) * 4))
+)
+
+
+class PasswordHashingPool:
+    """Runs CPU bound password hashing in worker processes, off the request threads.
+
+    At most as many hashes as there are workers run at once, with a bounded number
+    of requests waiting for a worker. Requests beyond that are turned away with a
+    503 rather than piling up behind a login storm. With no workers, hashing runs
+    on the calling thread, still bounded by the queue size.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        """Creates a pool, starting its worker processes on first use."""
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self.executor: Executor | None = None
+        self.executor_lock = threading.Lock()
+
+    def get_executor(self) -> Executor:
+        """Gets the worker processes, starting them if needed."""
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.executor
+
+    def acquire_slot(self) -> None:
+        """Takes a slot in the pool, raising a 503 if the pool is full."""
+        if not self.slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="too many password requests, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+    def run(self, function: Callable, *args: object) -> object:
+        """Runs a hashing function in the pool and waits for its result."""
+        self.acquire_slot()
+        try:
+            if self.workers == 0:
+                return function(*args)
+            return self.get_executor().submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    async def run_async(self, function: Callable, *args: object) -> object:
+        """Runs a hashing function in the pool without blocking the event loop."""
+        self.acquire_slot()
+        try:
+            if self.workers == 0:
+                return await run_in_threadpool(function, *args)
+            return await asyncio.wrap_future(
+                self.get_executor().submit(function, *args)
+            )
+        finally:
+            self.slots.release()
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        with self.executor_lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    workers=PASSWORD_HASHING_WORKERS, queue_size=PASSWORD_HASHING_QUEUE_SIZE
+)
@@ -0,0 +1,112 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Delete, Insert, Row, Select, Update, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database.models import IdempotencyKeys
+
+load_dotenv()
+
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def get_request_hash(request: BaseModel) -> str:
+    """Gets a hash of a request body, to tell whether a key is reused for another one."""
+    return hashlib.sha256(request.json(sort_keys=True).encode()).hexdigest()
+
+
+def delete_expired_idempotency_keys(user_id: int) -> Delete:
+    """Builds the statement removing a user's keys older than the time they are kept."""
+    return (
+        delete(IdempotencyKeys)
+        .where(IdempotencyKeys.user_id == user_id)
+        .where(
+            IdempotencyKeys.created_at
+            < func.now() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+        )
+    )
+
+
+def insert_idempotency_key(user_id: int, key: str, request_hash: str) -> Insert:
+    """Builds the statement claiming a key, returning nothing if it is already taken.
+
+    A request claiming a key that another transaction has claimed but not yet
+    committed waits for it, so a retry never runs alongside the original.
+    """
+    return (
+        insert(IdempotencyKeys)
+        .values(user_id=user_id, key=key, request_hash=request_hash)
+        .on_conflict_do_nothing(
+            index_elements=[IdempotencyKeys.user_id, IdempotencyKeys.key]
+        )
+        .returning(IdempotencyKeys.id)
+    )
+
+
+def select_idempotency_key(user_id: int, key: str) -> Select:
+    """Builds the query for the request hash and stored response of a user's key."""
+    return (
+        select(IdempotencyKeys.request_hash, IdempotencyKeys.response)
+        .where(IdempotencyKeys.user_id == user_id)
+        .where(IdempotencyKeys.key == key)
+    )
+
+
+def store_idempotent_response(user_id: int, key: str, response: dict) -> Update:
+    """Builds the statement storing the response of the request that claimed a key."""
+    return (
+        update(IdempotencyKeys)
+        .where(IdempotencyKeys.user_id == user_id)
+        .where(IdempotencyKeys.key == key)
+        .values(response=response)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_stored_response(stored_key: Row, request_hash: str) -> dict:
+    """Gets the stored response of a key, if it was claimed by the same request."""
+    if stored_key.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key has already been used for a different request",
+        )
+
+    return stored_key.response
+
+
+def claim_idempotency_key(
+    db: Session, user_id: int, key: str, request_hash: str
+) -> dict | None:
+    """Claims a key for a request, returning the stored response if it was already used."""
+    db.execute(delete_expired_idempotency_keys(user_id=user_id))
+    key_id = db.scalar(
+        insert_idempotency_key(user_id=user_id, key=key, request_hash=request_hash)
+    )
+    if key_id is not None:
+        return None
+
+    stored_key = db.execute(select_idempotency_key(user_id=user_id, key=key)).one()
+    return get_stored_response(stored_key=stored_key, request_hash=request_hash)
+
+
+async def claim_idempotency_key_async(
+    db: AsyncSession, user_id: int, key: str, request_hash: str
+) -> dict | None:
+    """Claims a key for a request using an async session."""
+    await db.execute(delete_expired_idempotency_keys(user_id=user_id))
+    key_id = await db.scalar(
+        insert_idempotency_key(user_id=user_id, key=key, request_hash=request_hash)
+    )
+    if key_id is not None:
+        return None
+
+    result = await db.execute(select_idempotency_key(user_id=user_id, key=key))
+    return get_stored_response(stored_key=result.one(), request_hash=request_hash)
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from sqlalchemy import Insert, Row, Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from src.database.models import OrderLines, Orders
+from src.routers.schemas.payment import PaymentBase
+
+
+def insert_order(user_id: int, payment: PaymentBase) -> Insert:
+    """Builds the statement adding an order for a payment, returning its id."""
+    return (
+        insert(Orders)
+        .values(
+            user_id=user_id,
+            total_cost=payment.payment_amount,
+            coupons_used=payment.coupons_to_use,
+        )
+        .returning(Orders.id)
+    )
+
+
+def get_order_lines(order_id: int, basket_items: list[Row]) -> list[dict]:
+    """Creates an order line for every basket item paid for in an order."""
+    return [
+        {
+            "order_id": order_id,
+            "product_id": basket_item.product_id,
+            "product_name": basket_item.product_name,
+            "unit_price": basket_item.unit_price,
+            "quantity": basket_item.quantity,
+            "total_cost": basket_item.cost,
+        }
+        for basket_item in basket_items
+    ]
+
+
+def create_order(
+    db: Session, user_id: int, payment: PaymentBase, basket_items: list[Row]
+) -> None:
+    """Adds an order and all of its lines to the current transaction."""
+    order_id = db.scalar(insert_order(user_id=user_id, payment=payment))
+    db.execute(
+        insert(OrderLines),
+        get_order_lines(order_id=order_id, basket_items=basket_items),
+    )
+
+
+async def create_order_async(
+    db: AsyncSession, user_id: int, payment: PaymentBase, basket_items: list[Row]
+) -> None:
+    """Adds an order and all of its lines to the current transaction using an async session."""
+    order_id = await db.scalar(insert_order(user_id=user_id, payment=payment))
+    await db.execute(
+        insert(OrderLines),
+        get_order_lines(order_id=order_id, basket_items=basket_items),
+    )
+
+
+def select_user_orders(
+    user_id: int,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> Select:
+    """Builds the query for a user's orders, optionally within a range of dates.
+
+    Orders are found through the (user_id, created_at, id) index and their lines
+    are loaded with one more query by order id, so no basket rows are read.
+    """
+    statement = (
+        select(Orders)
+        .options(selectinload(Orders.lines))
+        .where(Orders.user_id == user_id)
+    )
+
+    if created_after is not None:
+        statement = statement.where(Orders.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(Orders.created_at < created_before)
+
+    return statement
@@ -0,0 +1,143 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Numeric, Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor_value(value: datetime | Decimal) -> str:
+    """Encodes a sort key value JSON cannot hold, as an ISO date or a decimal string."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values: list) -> str:
+    """Encodes the sort key values of the last row of a page into an opaque cursor."""
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=encode_cursor_value).encode()
+    ).decode()
+
+
+def get_invalid_cursor_exception() -> HTTPException:
+    """Creates the exception raised for a malformed pagination cursor."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="invalid pagination cursor",
+    )
+
+
+def decode_cursor(cursor: str, key_count: int) -> list:
+    """Decodes a cursor back into sort key values, rejecting malformed cursors."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != key_count:
+        raise get_invalid_cursor_exception()
+
+    return values
+
+
+def parse_cursor_value(value: object, sort_key: InstrumentedAttribute) -> object:
+    """Turns a cursor value back into the type of the column it was taken from.
+
+    Values that are not of that type are rejected, so a tampered cursor is a 400
+    rather than an error from the database when the values are compared.
+    """
+    if isinstance(sort_key.type, (DateTime, Numeric)):
+        if not isinstance(value, str):
+            raise TypeError(f"{sort_key.key} cursor value must be a string")
+
+        if isinstance(sort_key.type, DateTime):
+            return datetime.fromisoformat(value)
+
+        amount = Decimal(value)
+        if not amount.is_finite():
+            raise ValueError(f"{sort_key.key} cursor value must be finite")
+        return amount
+
+    if isinstance(value, bool) or not isinstance(value, sort_key.type.python_type):
+        raise TypeError(
+            f"{sort_key.key} cursor value must be a {sort_key.type.python_type.__name__}"
+        )
+    return value
+
+
+def parse_cursor_values(values: list, sort_keys: list[InstrumentedAttribute]) -> list:
+    """Turns cursor values stored as strings back into datetimes or decimals."""
+    try:
+        return [
+            parse_cursor_value(value=value, sort_key=sort_key)
+            for value, sort_key in zip(values, sort_keys)
+        ]
+    except (InvalidOperation, TypeError, ValueError):
+        raise get_invalid_cursor_exception()
+
+
+def get_sort_keys(
+    sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute
+) -> list[InstrumentedAttribute]:
+    """Gets the columns rows are ordered by, using the id to break ties."""
+    if sort_column is id_column:
+        return [id_column]
+    return [sort_column, id_column]
+
+
+def paginate_query(
+    statement: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    after: str | None,
+    descending: bool = False,
+) -> Select:
+    """Applies keyset pagination to a query, fetching one extra row to spot a next page.
+
+    Rows are ordered by the sort column and then the id, and a page starts right
+    after the row the cursor was taken from, so an index on those columns lets the
+    database seek straight to the page however deep into the table it is.
+    """
+    sort_keys = get_sort_keys(sort_column=sort_column, id_column=id_column)
+
+    if after is not None:
+        cursor_values = parse_cursor_values(
+            values=decode_cursor(cursor=after, key_count=len(sort_keys)),
+            sort_keys=sort_keys,
+        )
+        if descending:
+            statement = statement.where(tuple_(*sort_keys) < tuple_(*cursor_values))
+        else:
+            statement = statement.where(tuple_(*sort_keys) > tuple_(*cursor_values))
+
+    if descending:
+        statement = statement.order_by(*(sort_key.desc() for sort_key in sort_keys))
+    else:
+        statement = statement.order_by(*sort_keys)
+
+    return statement.limit(limit + 1)
+
+
+def split_page(
+    rows: list,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+) -> tuple[list, str | None]:
+    """Splits off the extra row fetched by paginate_query, returning the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    sort_keys = get_sort_keys(sort_column=sort_column, id_column=id_column)
+    next_cursor = encode_cursor([getattr(page[-1], key.key) for key in sort_keys])
+    return page, next_cursor
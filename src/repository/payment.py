@@ -1,35 +1,44 @@
+from decimal import Decimal
+
 from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Row, Select, Update, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from src.database.models import Baskets, Users
+from src.database.models import Baskets, Products, Users
+from src.repository.basket import (
+    basket_item_cost,
+    discounted_product_price,
+    is_basket_empty,
+    remove_from_basket_summary,
+)
+from src.repository.idempotency import (
+    claim_idempotency_key,
+    claim_idempotency_key_async,
+    get_request_hash,
+    store_idempotent_response,
+)
+from src.repository.order import create_order, create_order_async
 from src.routers.schemas.payment import PaymentBase
+from src.routers.schemas.user import UserUnique
 
 
-def does_user_have_enough_coupons(
-    payment: PaymentBase, user: Users
-) -> None | HTTPException:
-    """Checks to see if user has as many coupons as they are trying to use."""
-    if payment.coupons_to_use > user.coupon_count:
-        raise HTTPException(
-            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-            detail=f"You do not have {payment.coupons_to_use} coupons!",
-        )
-
-
-def get_total_cost_of_product(product: Baskets, basket_item: Baskets) -> float:
-    """Gets the total cost of a quantity of a specific product in user basket."""
-    product_quantity = basket_item.quantity
-
-    total_cost_of_item = (
-        product.price - product.price * (product.sale_percentage / 100)
-    ) * product_quantity
-
-    return total_cost_of_item
+def get_not_enough_coupons_exception(payment: PaymentBase) -> HTTPException:
+    """Creates the exception raised when a user pays with more coupons than they have."""
+    return HTTPException(
+        status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+        detail=f"You do not have {payment.coupons_to_use} coupons!",
+    )
 
 
 def has_user_paid_the_right_amount(
-    payment: PaymentBase, total_basket_cost: float
+    payment: PaymentBase, total_basket_cost: Decimal
 ) -> None:
-    """Checks to see if the user has paid too little or too much for the basket of goods."""
+    """Checks to see if the user has paid too little or too much for the basket of goods.
+
+    Both amounts are exact to the cent, so they can be compared for equality.
+    """
     if payment.payment_amount > total_basket_cost:
         raise HTTPException(
             status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
@@ -40,3 +49,178 @@ def has_user_paid_the_right_amount(
             status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
             detail="You have paid too little!",
         )
+
+
+def charge_user_returning(user_id: int, payment: PaymentBase) -> Update:
+    """Builds the update charging a user, only if they have the coupons they use.
+
+    Coupons are taken and earned, one for every 5000 paid, by the database from
+    the current row, so concurrent payments can never spend the same coupons.
+    """
+    new_coupons = int(payment.payment_amount // 5000)
+    return (
+        update(Users)
+        .where(Users.id == user_id)
+        .where(Users.coupon_count >= payment.coupons_to_use)
+        .values(
+            total_spent_overall=Users.total_spent_overall + payment.payment_amount,
+            coupon_count=Users.coupon_count - payment.coupons_to_use + new_coupons,
+        )
+        .returning(*Users.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def select_user_for_update(user_id: int) -> Select:
+    """Builds the query locking a user for the rest of the checkout."""
+    return select(Users.id).where(Users.id == user_id).with_for_update()
+
+
+def select_basket_items_for_checkout(user_id: int) -> Select:
+    """Builds the query locking a user's basket items and getting what each one costs."""
+    return (
+        select(
+            Baskets.id,
+            Baskets.product_id,
+            Products.name.label("product_name"),
+            discounted_product_price.label("unit_price"),
+            Baskets.quantity,
+            basket_item_cost.label("cost"),
+        )
+        .join(Products, Products.id == Baskets.product_id)
+        .where(Baskets.user_id == user_id)
+        .order_by(Baskets.id)
+        .with_for_update(of=Baskets)
+    )
+
+
+def get_checkout_response(user: Row) -> dict:
+    """Creates the response of a checkout, which is the charged user's empty basket."""
+    return jsonable_encoder(UserUnique(**user._mapping, basket_items=[]))
+
+
+def check_out_user_basket(
+    db: Session, user_id: int, payment: PaymentBase, idempotency_key: str | None
+) -> dict:
+    """Charges a user for their basket and empties it in a single transaction.
+
+    The user and their basket items are locked first, the items paid for are
+    written to a new order, and only those items are removed. With an idempotency
+    key, the response is stored with the checkout, so a retry gets it back
+    without being charged again.
+    """
+    request_hash = get_request_hash(request=payment)
+
+    try:
+        if idempotency_key is not None:
+            stored_response = claim_idempotency_key(
+                db=db, user_id=user_id, key=idempotency_key, request_hash=request_hash
+            )
+            if stored_response is not None:
+                db.rollback()
+                return stored_response
+
+        db.execute(select_user_for_update(user_id=user_id))
+        basket_items = db.execute(select_basket_items_for_checkout(user_id)).all()
+        is_basket_empty(basket_products=basket_items)
+        has_user_paid_the_right_amount(
+            payment=payment,
+            total_basket_cost=sum(basket_item.cost for basket_item in basket_items),
+        )
+
+        user = db.execute(
+            charge_user_returning(user_id=user_id, payment=payment)
+        ).one_or_none()
+        if user is None:
+            raise get_not_enough_coupons_exception(payment=payment)
+
+        create_order(db=db, user_id=user_id, payment=payment, basket_items=basket_items)
+        db.execute(
+            delete(Baskets).where(
+                Baskets.id.in_([basket_item.id for basket_item in basket_items])
+            )
+        )
+        db.execute(
+            remove_from_basket_summary(
+                user_id=user_id,
+                total_items=sum(basket_item.quantity for basket_item in basket_items),
+                total_cost=sum(basket_item.cost for basket_item in basket_items),
+            )
+        )
+        response = get_checkout_response(user=user)
+        if idempotency_key is not None:
+            db.execute(
+                store_idempotent_response(
+                    user_id=user_id, key=idempotency_key, response=response
+                )
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return response
+
+
+async def check_out_user_basket_async(
+    db: AsyncSession,
+    user_id: int,
+    payment: PaymentBase,
+    idempotency_key: str | None,
+) -> dict:
+    """Charges a user for their basket and empties it using an async session."""
+    request_hash = get_request_hash(request=payment)
+
+    try:
+        if idempotency_key is not None:
+            stored_response = await claim_idempotency_key_async(
+                db=db, user_id=user_id, key=idempotency_key, request_hash=request_hash
+            )
+            if stored_response is not None:
+                await db.rollback()
+                return stored_response
+
+        await db.execute(select_user_for_update(user_id=user_id))
+        result = await db.execute(select_basket_items_for_checkout(user_id))
+        basket_items = result.all()
+        is_basket_empty(basket_products=basket_items)
+        has_user_paid_the_right_amount(
+            payment=payment,
+            total_basket_cost=sum(basket_item.cost for basket_item in basket_items),
+        )
+
+        result = await db.execute(
+            charge_user_returning(user_id=user_id, payment=payment)
+        )
+        user = result.one_or_none()
+        if user is None:
+            raise get_not_enough_coupons_exception(payment=payment)
+
+        await create_order_async(
+            db=db, user_id=user_id, payment=payment, basket_items=basket_items
+        )
+        await db.execute(
+            delete(Baskets).where(
+                Baskets.id.in_([basket_item.id for basket_item in basket_items])
+            )
+        )
+        await db.execute(
+            remove_from_basket_summary(
+                user_id=user_id,
+                total_items=sum(basket_item.quantity for basket_item in basket_items),
+                total_cost=sum(basket_item.cost for basket_item in basket_items),
+            )
+        )
+        response = get_checkout_response(user=user)
+        if idempotency_key is not None:
+            await db.execute(
+                store_idempotent_response(
+                    user_id=user_id, key=idempotency_key, response=response
+                )
+            )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return response
@@ -1,6 +1,15 @@
+from decimal import Decimal
+
 from fastapi import HTTPException, status
+from sqlalchemy import Row, Select, Update, column, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from src.database.models import Products
+from src.repository.basket import (
+    does_change_basket_costs,
+    mark_basket_summaries_stale,
+)
 
 
 def does_product_exist_in_database(product: Products) -> None:
@@ -22,3 +31,149 @@ def is_there_enough_stock(
             status_code=status.HTTP_406_NOT_ACCEPTABLE,
             detail=f"there are only {amount_of_stock} items left for this product",
         )
+
+
+def select_products(
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    on_sale: bool | None = None,
+    in_stock: bool | None = None,
+) -> Select:
+    """Builds the query for products matching the given catalogue filters."""
+    statement = select(Products)
+
+    if min_price is not None:
+        statement = statement.where(Products.price >= min_price)
+    if max_price is not None:
+        statement = statement.where(Products.price <= max_price)
+    if on_sale is not None:
+        statement = statement.where(
+            Products.sale_percentage > 0 if on_sale else Products.sale_percentage == 0
+        )
+    if in_stock is not None:
+        statement = statement.where(
+            Products.stock > 0 if in_stock else Products.stock <= 0
+        )
+
+    return statement
+
+
+def update_product_stock_if_available(product_id: int, quantity: int) -> Update:
+    """Builds the conditional update taking stock of a product if enough is left."""
+    return (
+        update(Products)
+        .where(Products.id == product_id)
+        .where(Products.stock >= quantity)
+        .values(stock=Products.stock - quantity)
+        .returning(Products.stock)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_unique_product_returning(product_id: int, new_values: dict) -> Update:
+    """Builds the update of a unique product, returning the updated row."""
+    return (
+        update(Products)
+        .where(Products.id == product_id)
+        .values(new_values)
+        .returning(*Products.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_unique_product(db: Session, product_id: int, new_values: dict) -> Row:
+    """Updates a unique product in a single round trip and commits the change.
+
+    New values can be SQL expressions such as Products.stock + 10, so they are
+    worked out by the database from the current row without reading it first.
+    Changing the price or sale marks stale the summaries of baskets holding it.
+    """
+    product = db.execute(
+        update_unique_product_returning(product_id=product_id, new_values=new_values)
+    ).one_or_none()
+    does_product_exist_in_database(product=product)
+    if does_change_basket_costs(new_values=new_values):
+        db.execute(mark_basket_summaries_stale(product_ids=[product_id]))
+    db.commit()
+    return product
+
+
+async def update_unique_product_async(
+    db: AsyncSession, product_id: int, new_values: dict
+) -> Row:
+    """Updates a unique product in a single round trip using an async session."""
+    result = await db.execute(
+        update_unique_product_returning(product_id=product_id, new_values=new_values)
+    )
+    product = result.one_or_none()
+    does_product_exist_in_database(product=product)
+    if does_change_basket_costs(new_values=new_values):
+        await db.execute(mark_basket_summaries_stale(product_ids=[product_id]))
+    await db.commit()
+    return product
+
+
+def update_products_from_values(
+    product_column: InstrumentedAttribute, new_values: list[tuple[int, object]]
+) -> Update:
+    """Builds the statement setting a column of many products in one round trip.
+
+    The new values are sent as a VALUES list joined to the products by id, and the
+    ids of the products that were updated are returned.
+    """
+    new_values_table = values(
+        column("id", Products.id.type),
+        column("value", product_column.type),
+        name="new_values",
+    ).data(new_values)
+    return (
+        update(Products)
+        .where(Products.id == new_values_table.c.id)
+        .values({product_column: new_values_table.c.value})
+        .returning(Products.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reserve_product_stock(db: Session, product_id: int, quantity: int) -> int:
+    """Atomically takes stock of a product, returning how much stock is left.
+
+    The stock is only decremented if enough of it is left, in a single conditional
+    update, so concurrent reservations of the same product can never oversell it.
+    """
+    remaining_stock = db.scalar(
+        update_product_stock_if_available(product_id=product_id, quantity=quantity)
+    )
+
+    if remaining_stock is None:
+        product = db.query(Products).filter(Products.id == product_id).first()
+        does_product_exist_in_database(product=product)
+        is_there_enough_stock(
+            quantity_purchased=quantity,
+            amount_of_stock=product.stock,
+        )
+        return reserve_product_stock(db=db, product_id=product_id, quantity=quantity)
+
+    return remaining_stock
+
+
+async def reserve_product_stock_async(
+    db: AsyncSession, product_id: int, quantity: int
+) -> int:
+    """Atomically takes stock of a product using an async session."""
+    remaining_stock = await db.scalar(
+        update_product_stock_if_available(product_id=product_id, quantity=quantity)
+    )
+
+    if remaining_stock is None:
+        product = await db.scalar(select(Products).where(Products.id == product_id))
+        does_product_exist_in_database(product=product)
+        is_there_enough_stock(
+            quantity_purchased=quantity,
+            amount_of_stock=product.stock,
+        )
+        return await reserve_product_stock_async(
+            db=db, product_id=product_id, quantity=quantity
+        )
+
+    return remaining_stock
@@ -0,0 +1,285 @@
+import csv
+import io
+import json
+import os
+from typing import Iterator
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Insert
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from src.cache.product import invalidate_cached_product, invalidate_cached_products
+from src.database.models import Products
+from src.repository.basket import BASKET_COST_COLUMNS, mark_basket_summaries_stale
+from src.repository.product import update_products_from_values
+from src.routers.schemas.product import ProductCreate
+
+load_dotenv()
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+
+async def read_bulk_rows(request: Request) -> list[dict]:
+    """Reads the rows of a bulk upload sent as a JSON array or as CSV with a header."""
+    body = await request.body()
+
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        return list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        rows = None
+
+    if not isinstance(rows, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="expected a JSON array or a text/csv body",
+        )
+
+    return rows
+
+
+def get_row_error(row_number: int, detail: str) -> dict:
+    """Creates the error reported for a row that was not applied."""
+    return {"row": row_number, "detail": detail}
+
+
+def validate_bulk_rows(
+    rows: list[dict], row_model: type[BaseModel]
+) -> tuple[list[tuple[int, BaseModel]], list[dict]]:
+    """Validates every row, numbering rows from one and setting aside invalid ones."""
+    valid_rows = []
+    errors = []
+
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            valid_rows.append((row_number, row_model.parse_obj(row)))
+        except ValidationError as error:
+            detail = "; ".join(
+                f"{'.'.join(str(location) for location in row_error['loc'])}: "
+                f"{row_error['msg']}"
+                for row_error in error.errors()
+            )
+            errors.append(get_row_error(row_number=row_number, detail=detail))
+
+    return valid_rows, errors
+
+
+def split_into_chunks(rows: list) -> Iterator[list]:
+    """Splits rows into chunks written with one statement and committed together."""
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        yield rows[start : start + BULK_CHUNK_SIZE]
+
+
+def insert_new_products() -> Insert:
+    """Builds the statement inserting many products, skipping names already taken."""
+    return (
+        insert(Products)
+        .on_conflict_do_nothing(index_elements=[Products.name])
+        .returning(Products.name)
+    )
+
+
+def set_aside_duplicate_rows(
+    valid_rows: list[tuple[int, BaseModel]], field: str
+) -> tuple[list[tuple[int, BaseModel]], list[dict]]:
+    """Sets aside rows whose field value appears earlier in the same upload."""
+    seen_values = set()
+    unique_rows = []
+    errors = []
+
+    for row_number, row in valid_rows:
+        if getattr(row, field) in seen_values:
+            errors.append(
+                get_row_error(
+                    row_number=row_number, detail=f"duplicate product {field}"
+                )
+            )
+        else:
+            seen_values.add(getattr(row, field))
+            unique_rows.append((row_number, row))
+
+    return unique_rows, errors
+
+
+def validate_unique_bulk_rows(
+    rows: list[dict], row_model: type[BaseModel], unique_field: str
+) -> tuple[list[tuple[int, BaseModel]], list[dict]]:
+    """Validates every row and sets aside rows repeating an earlier row's field value."""
+    valid_rows, errors = validate_bulk_rows(rows=rows, row_model=row_model)
+    unique_rows, duplicate_errors = set_aside_duplicate_rows(
+        valid_rows=valid_rows, field=unique_field
+    )
+    return unique_rows, errors + duplicate_errors
+
+
+def get_chunk_write_errors(chunk: list[tuple[int, BaseModel]]) -> list[dict]:
+    """Creates the errors reported for every row of a chunk that failed to write."""
+    return [
+        get_row_error(row_number=row_number, detail="could not be written")
+        for row_number, _ in chunk
+    ]
+
+
+def import_products(db: Session, rows: list[dict]) -> dict:
+    """Inserts new products in chunks, reporting rows that are invalid or already exist."""
+    valid_rows, errors = validate_unique_bulk_rows(
+        rows=rows, row_model=ProductCreate, unique_field="name"
+    )
+    succeeded = 0
+
+    for chunk in split_into_chunks(valid_rows):
+        try:
+            inserted_names = set(
+                db.scalars(
+                    insert_new_products(), [product.dict() for _, product in chunk]
+                )
+            )
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            errors += get_chunk_write_errors(chunk=chunk)
+            continue
+
+        invalidate_cached_product()
+        succeeded += len(inserted_names)
+        errors += [
+            get_row_error(row_number=row_number, detail="product already exists")
+            for row_number, product in chunk
+            if product.name not in inserted_names
+        ]
+
+    return {
+        "succeeded": succeeded,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+    }
+
+
+async def import_products_async(db: AsyncSession, rows: list[dict]) -> dict:
+    """Inserts new products in chunks using an async session."""
+    valid_rows, errors = validate_unique_bulk_rows(
+        rows=rows, row_model=ProductCreate, unique_field="name"
+    )
+    succeeded = 0
+
+    for chunk in split_into_chunks(valid_rows):
+        try:
+            result = await db.scalars(
+                insert_new_products(), [product.dict() for _, product in chunk]
+            )
+            inserted_names = set(result)
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            errors += get_chunk_write_errors(chunk=chunk)
+            continue
+
+        invalidate_cached_product()
+        succeeded += len(inserted_names)
+        errors += [
+            get_row_error(row_number=row_number, detail="product already exists")
+            for row_number, product in chunk
+            if product.name not in inserted_names
+        ]
+
+    return {
+        "succeeded": succeeded,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+    }
+
+
+def update_products_in_bulk(
+    db: Session,
+    rows: list[dict],
+    row_model: type[BaseModel],
+    product_column: InstrumentedAttribute,
+    field: str,
+) -> dict:
+    """Sets a column of many products in chunks, reporting invalid or missing products."""
+    valid_rows, errors = validate_unique_bulk_rows(
+        rows=rows, row_model=row_model, unique_field="id"
+    )
+    succeeded = 0
+
+    for chunk in split_into_chunks(valid_rows):
+        try:
+            updated_ids = set(
+                db.scalars(
+                    update_products_from_values(
+                        product_column,
+                        [(row.id, getattr(row, field)) for _, row in chunk],
+                    )
+                )
+            )
+            if product_column.key in BASKET_COST_COLUMNS and updated_ids:
+                db.execute(mark_basket_summaries_stale(product_ids=list(updated_ids)))
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            errors += get_chunk_write_errors(chunk=chunk)
+            continue
+
+        invalidate_cached_products(ids=list(updated_ids))
+        succeeded += sum(row.id in updated_ids for _, row in chunk)
+        errors += [
+            get_row_error(row_number=row_number, detail="product does not exist")
+            for row_number, row in chunk
+            if row.id not in updated_ids
+        ]
+
+    return {
+        "succeeded": succeeded,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+    }
+
+
+async def update_products_in_bulk_async(
+    db: AsyncSession,
+    rows: list[dict],
+    row_model: type[BaseModel],
+    product_column: InstrumentedAttribute,
+    field: str,
+) -> dict:
+    """Sets a column of many products in chunks using an async session."""
+    valid_rows, errors = validate_unique_bulk_rows(
+        rows=rows, row_model=row_model, unique_field="id"
+    )
+    succeeded = 0
+
+    for chunk in split_into_chunks(valid_rows):
+        try:
+            result = await db.scalars(
+                update_products_from_values(
+                    product_column,
+                    [(row.id, getattr(row, field)) for _, row in chunk],
+                )
+            )
+            updated_ids = set(result)
+            if product_column.key in BASKET_COST_COLUMNS and updated_ids:
+                await db.execute(
+                    mark_basket_summaries_stale(product_ids=list(updated_ids))
+                )
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            errors += get_chunk_write_errors(chunk=chunk)
+            continue
+
+        invalidate_cached_products(ids=list(updated_ids))
+        succeeded += sum(row.id in updated_ids for _, row in chunk)
+        errors += [
+            get_row_error(row_number=row_number, detail="product does not exist")
+            for row_number, row in chunk
+            if row.id not in updated_ids
+        ]
+
+    return {
+        "succeeded": succeeded,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+    }
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database.models import Products
+from src.routers.schemas.product import ExportFormat
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    Products.id,
+    Products.name,
+    Products.price,
+    Products.stock,
+    Products.sale_percentage,
+]
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def select_product_export() -> Select:
+    """Builds the query streaming the catalogue from a server-side cursor in batches."""
+    return (
+        select(*EXPORT_COLUMNS)
+        .order_by(Products.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def format_products(products: list, export_format: ExportFormat) -> str:
+    """Formats a batch of products as NDJSON lines or CSV rows.
+
+    Prices are written as exact decimal strings, such as "10.50", in both formats.
+    """
+    if export_format == ExportFormat.ndjson:
+        return "".join(
+            json.dumps(product._asdict(), default=str) + "\n" for product in products
+        )
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(products)
+    return buffer.getvalue()
+
+
+def get_export_header(export_format: ExportFormat) -> str:
+    """Gets the text written before the products, which is a header row for CSV."""
+    if export_format == ExportFormat.ndjson:
+        return ""
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(column.key for column in EXPORT_COLUMNS)
+    return buffer.getvalue()
+
+
+def stream_product_export(db: Session, export_format: ExportFormat) -> Iterator[str]:
+    """Streams the whole catalogue, holding one batch of products in memory at a time."""
+    yield get_export_header(export_format=export_format)
+
+    for products in db.execute(select_product_export()).partitions():
+        yield format_products(products=products, export_format=export_format)
+
+
+async def stream_product_export_async(
+    db: AsyncSession, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Streams the whole catalogue using an async session."""
+    yield get_export_header(export_format=export_format)
+
+    result = await db.stream(select_product_export())
+    async for products in result.partitions():
+        yield format_products(products=products, export_format=export_format)
@@ -0,0 +1,159 @@
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security.oauth2 import OAuth2PasswordRequestForm
+
+load_dotenv()
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "20"))
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", "5"))
+LOGIN_EMAIL_PER_MINUTE = float(os.getenv("LOGIN_EMAIL_PER_MINUTE", "5"))
+
+# refills a bucket stored as a hash of its tokens and when it was last updated,
+# then takes a token from it, returning how long to wait if it was empty
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_second = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * refill_per_second)
+
+local wait_seconds = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_seconds = (1 - tokens) / refill_per_second
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / refill_per_second * 1000))
+return tostring(wait_seconds)
+"""
+
+
+class RateLimiterBackend(ABC):
+    """Abstract class for storing token buckets."""
+
+    @abstractmethod
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Takes a token from a bucket, returning how long to wait if it is empty."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Refills every bucket."""
+
+
+class InMemoryRateLimiterBackend(RateLimiterBackend):
+    """Token buckets kept in-process, so each worker limits attempts separately.
+
+    Only the most recently used buckets are kept, so a flood of distinct keys
+    cannot grow memory without bound.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        """Creates a backend with no buckets."""
+        self.max_keys = max_keys
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Takes a token from a bucket, returning how long to wait if it is empty."""
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            wait_seconds = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait_seconds = (1 - tokens) / refill_per_second
+
+            self.buckets[key] = (tokens, now)
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+
+        return wait_seconds
+
+    def clear(self) -> None:
+        """Refills every bucket."""
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisRateLimiterBackend(RateLimiterBackend):
+    """Token buckets shared between workers, updated atomically by a Redis script."""
+
+    def __init__(self, client: object, prefix: str = "rate-limit:") -> None:
+        """Creates a backend storing its buckets under a key prefix."""
+        self.client = client
+        self.prefix = prefix
+        self.take_token_script = client.register_script(TAKE_TOKEN_SCRIPT)
+
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Takes a token from a bucket, returning how long to wait if it is empty."""
+        wait_seconds = self.take_token_script(
+            keys=[self.prefix + key], args=[capacity, refill_per_second, time.time()]
+        )
+        return float(wait_seconds)
+
+    def clear(self) -> None:
+        """Refills every bucket under the backend's key prefix."""
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+def create_rate_limiter_backend() -> RateLimiterBackend:
+    """Creates the rate limiter backend chosen by the RATE_LIMIT_BACKEND setting."""
+    if RATE_LIMIT_BACKEND == "redis":
+        import redis
+
+        return RedisRateLimiterBackend(client=redis.Redis.from_url(REDIS_URL))
+
+    return InMemoryRateLimiterBackend(max_keys=RATE_LIMIT_MAX_KEYS)
+
+
+def check_rate_limit(key: str, capacity: int, per_minute: float) -> None:
+    """Takes a token from a bucket, raising a 429 if it is empty."""
+    wait_seconds = login_rate_limiter.take_token(
+        key=key, capacity=capacity, refill_per_second=per_minute / 60
+    )
+    if wait_seconds > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(wait_seconds))},
+        )
+
+
+def limit_login_attempts(
+    request: Request, user_credentials: OAuth2PasswordRequestForm = Depends()
+) -> None:
+    """Rejects login attempts beyond the limits for the client's IP and the email."""
+    client_ip = request.client.host if request.client is not None else "unknown"
+    check_rate_limit(
+        key=f"login:ip:{client_ip}",
+        capacity=LOGIN_IP_BURST,
+        per_minute=LOGIN_IP_PER_MINUTE,
+    )
+    check_rate_limit(
+        key=f"login:email:{user_credentials.username.lower()}",
+        capacity=LOGIN_EMAIL_BURST,
+        per_minute=LOGIN_EMAIL_PER_MINUTE,
+    )
+
+
+login_rate_limiter = create_rate_limiter_backend()
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+from contextlib import ExitStack
+from typing import Callable
+
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.database.database_connection import SessionLocal
+from src.database.models import Products
+from src.repository.product import does_product_exist_in_database, is_there_enough_stock
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+HOT_STOCK_SHARD_COUNT = int(os.getenv("HOT_STOCK_SHARD_COUNT", "8"))
+HOT_STOCK_LEASE_SIZE = int(os.getenv("HOT_STOCK_LEASE_SIZE", "100"))
+HOT_STOCK_FLUSH_SECONDS = float(os.getenv("HOT_STOCK_FLUSH_SECONDS", "5"))
+
+
+class StockShard:
+    """A slice of a hot product's stock that can be reserved from on its own."""
+
+    def __init__(self) -> None:
+        """Creates an empty stock shard."""
+        self.lock = threading.Lock()
+        self.stock = 0
+
+
+class ShardedStockCounter:
+    """In-process stock counter for a hot product, split across several shards.
+
+    Stock is leased from the product's row in the 'products' table in batches and
+    spread across the shards, so most basket adds only lock a single shard in memory
+    instead of the product row. Leased stock that has not been reserved is handed
+    back to the product row whenever the counter is flushed.
+    """
+
+    def __init__(
+        self,
+        product_id: int,
+        shard_count: int,
+        lease_size: int,
+        session_factory: Callable[[], Session],
+    ) -> None:
+        """Creates a counter with empty shards for a product."""
+        self.product_id = product_id
+        self.lease_size = lease_size
+        self.session_factory = session_factory
+        self.shards = [StockShard() for _ in range(shard_count)]
+
+    def reserve(self, quantity: int) -> None:
+        """Takes stock from the shards, leasing more from the database if they run dry."""
+        first_shard = random.randrange(len(self.shards))
+
+        for shard in self.shards[first_shard:] + self.shards[:first_shard]:
+            with shard.lock:
+                if shard.stock >= quantity:
+                    shard.stock -= quantity
+                    return
+
+        with self._lock_all_shards():
+            local_stock = sum(shard.stock for shard in self.shards)
+            if local_stock < quantity:
+                local_stock += self._lease_stock(
+                    max(quantity - local_stock, self.lease_size)
+                )
+            self._spread_stock(local_stock)
+
+            is_there_enough_stock(
+                quantity_purchased=quantity,
+                amount_of_stock=local_stock,
+            )
+            self._spread_stock(local_stock - quantity)
+
+    def release(self, quantity: int) -> None:
+        """Gives reserved stock back to one of the shards."""
+        shard = random.choice(self.shards)
+        with shard.lock:
+            shard.stock += quantity
+
+    def flush(self) -> None:
+        """Hands any leased stock that has not been reserved back to the database."""
+        with self._lock_all_shards():
+            unreserved_stock = sum(shard.stock for shard in self.shards)
+            if unreserved_stock == 0:
+                return
+
+            with self.session_factory() as db:
+                db.execute(
+                    update(Products)
+                    .where(Products.id == self.product_id)
+                    .values(stock=Products.stock + unreserved_stock)
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+
+            self._spread_stock(0)
+
+    def _lease_stock(self, amount: int) -> int:
+        """Takes up to an amount of stock from the product row, returning how much."""
+        with self.session_factory() as db:
+            product = db.execute(
+                select(Products).where(Products.id == self.product_id).with_for_update()
+            ).scalar_one_or_none()
+            does_product_exist_in_database(product=product)
+
+            leased_stock = min(product.stock, amount)
+            product.stock -= leased_stock
+            db.commit()
+
+        return leased_stock
+
+    def _spread_stock(self, stock: int) -> None:
+        """Spreads stock evenly over the shards, which must all be locked."""
+        share, remainder = divmod(stock, len(self.shards))
+        for index, shard in enumerate(self.shards):
+            shard.stock = share + (1 if index < remainder else 0)
+
+    def _lock_all_shards(self) -> ExitStack:
+        """Locks every shard, always in the same order to avoid deadlocks."""
+        stack = ExitStack()
+        for shard in self.shards:
+            stack.enter_context(shard.lock)
+        return stack
+
+
+class HotStockRegistry:
+    """Keeps a sharded stock counter for every product flagged as hot."""
+
+    def __init__(
+        self,
+        shard_count: int = HOT_STOCK_SHARD_COUNT,
+        lease_size: int = HOT_STOCK_LEASE_SIZE,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        """Creates a registry with no hot products."""
+        self.shard_count = shard_count
+        self.lease_size = lease_size
+        self.session_factory = session_factory
+        self.counters: dict[int, ShardedStockCounter] = {}
+        self.retired_counters: list[ShardedStockCounter] = []
+        self.lock = threading.Lock()
+
+    def get_counter(self, product_id: int) -> ShardedStockCounter | None:
+        """Gets the sharded stock counter of a product if it is flagged as hot."""
+        return self.counters.get(product_id)
+
+    def flush(self) -> None:
+        """Reconciles every counter with the database and picks up new hot products."""
+        with self.lock:
+            with self.session_factory() as db:
+                hot_product_ids = set(
+                    db.scalars(select(Products.id).where(Products.is_hot)).all()
+                )
+
+            flushed_counters = self.retired_counters + list(self.counters.values())
+            counters = {}
+            for product_id in hot_product_ids:
+                counter = self.counters.get(product_id)
+                if counter is None:
+                    counter = ShardedStockCounter(
+                        product_id=product_id,
+                        shard_count=self.shard_count,
+                        lease_size=self.lease_size,
+                        session_factory=self.session_factory,
+                    )
+                counters[product_id] = counter
+            self.retired_counters = [
+                counter
+                for product_id, counter in self.counters.items()
+                if product_id not in counters
+            ]
+            self.counters = counters
+
+            for counter in flushed_counters:
+                counter.flush()
+
+
+hot_stock = HotStockRegistry()
+
+
+async def flush_hot_stock_periodically() -> None:
+    """Flushes the hot stock registry every few seconds until cancelled."""
+    while True:
+        try:
+            await run_in_threadpool(hot_stock.flush)
+        except Exception:
+            logger.exception("failed to flush hot product stock")
+        await asyncio.sleep(HOT_STOCK_FLUSH_SECONDS)
@@ -1,4 +1,7 @@
 from fastapi import HTTPException, status
+from sqlalchemy import Row, Update, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from src.database.models import Users
 
@@ -10,3 +13,35 @@ def does_user_already_exist(user: Users) -> None:
             status_code=status.HTTP_406_NOT_ACCEPTABLE,
             detail="user with that email already exists, please use a different email",
         )
+
+
+def update_unique_user_returning(user_id: int, new_values: dict) -> Update:
+    """Builds the update of a unique user, returning the updated row."""
+    return (
+        update(Users)
+        .where(Users.id == user_id)
+        .values(new_values)
+        .returning(*Users.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def update_unique_user(db: Session, user_id: int, new_values: dict) -> Row:
+    """Updates a unique user in a single round trip and commits the change."""
+    user = db.execute(
+        update_unique_user_returning(user_id=user_id, new_values=new_values)
+    ).one()
+    db.commit()
+    return user
+
+
+async def update_unique_user_async(
+    db: AsyncSession, user_id: int, new_values: dict
+) -> Row:
+    """Updates a unique user in a single round trip using an async session."""
+    result = await db.execute(
+        update_unique_user_returning(user_id=user_id, new_values=new_values)
+    )
+    user = result.one()
+    await db.commit()
+    return user
@@ -0,0 +1,165 @@
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_connection import get_async_db
+from src.database.models import Baskets, Users
+from src.repository.authentication import (
+    get_current_user_async,
+    validate_correct_user,
+    validate_correct_user_or_admin,
+)
+from src.repository.basket import (
+    add_item_to_user_basket_async,
+    get_basket_summary_async,
+    get_user_basket_summary_async,
+    remove_item_from_user_basket_async,
+)
+from src.repository.basket_operations import apply_basket_operations_async
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.product import reserve_product_stock_async
+from src.repository.stock_shards import hot_stock
+from src.routers.schemas.basket import (
+    BasketCreate,
+    BasketsBase,
+    BasketSummary,
+    BulkBasketUpdate,
+    DeleteBasketProduct,
+)
+
+load_dotenv()
+
+router = APIRouter(
+    prefix="/basket",
+    tags=["Baskets"],
+)
+
+
+@router.get("/all", status_code=status.HTTP_200_OK, response_model=list[BasketsBase])
+async def get_all_basket_items(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> list[BasketsBase]:
+    """Get a page of basket items from database, with the next page's cursor in a header."""
+    basket_items_query = paginate_query(
+        select(Baskets).where(Baskets.user_id == current_user.id),
+        sort_column=Baskets.id,
+        id_column=Baskets.id,
+        limit=limit,
+        after=after,
+    )
+    result = await db.scalars(basket_items_query)
+    basket_items, next_cursor = split_page(
+        result.all(), sort_column=Baskets.id, id_column=Baskets.id, limit=limit
+    )
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return basket_items
+
+
+@router.post("/{id}", status_code=status.HTTP_201_CREATED, response_model=BasketsBase)
+async def create_new_basket_item(
+    id: int,
+    new_item: BasketCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> BasketsBase:
+    """Create a new basket item."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    hot_stock_counter = hot_stock.get_counter(product_id=new_item.product_id)
+    if hot_stock_counter is None:
+        await reserve_product_stock_async(
+            db=db,
+            product_id=new_item.product_id,
+            quantity=new_item.quantity,
+        )
+    else:
+        await run_in_threadpool(hot_stock_counter.reserve, quantity=new_item.quantity)
+
+    try:
+        return await add_item_to_user_basket_async(
+            db=db,
+            user_id=id,
+            new_item=new_item,
+            is_hot_product=hot_stock_counter is not None,
+        )
+    except Exception:
+        if hot_stock_counter is not None:
+            hot_stock_counter.release(quantity=new_item.quantity)
+        raise
+
+
+@router.post(
+    "/{id}/bulk", status_code=status.HTTP_200_OK, response_model=list[BasketsBase]
+)
+async def update_unique_user_basket_in_bulk(
+    id: int,
+    basket_update: BulkBasketUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> list[BasketsBase]:
+    """Add, remove and set the quantity of many basket items in one transaction."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    await apply_basket_operations_async(
+        db=db, user_id=id, operations=basket_update.operations
+    )
+    basket_items = await db.scalars(
+        select(Baskets).where(Baskets.user_id == id).order_by(Baskets.id)
+    )
+    return basket_items.all()
+
+
+@router.get("/{id}", status_code=status.HTTP_200_OK)
+async def get_unique_user_basket_information(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> dict:
+    """Get detailed basket info for a unique user."""
+    validate_correct_user_or_admin(id=id, current_user=current_user)
+
+    return await get_user_basket_summary_async(db=db, user_id=id)
+
+
+@router.get(
+    "/{id}/summary", status_code=status.HTTP_200_OK, response_model=BasketSummary
+)
+async def get_unique_user_basket_summary(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> BasketSummary:
+    """Get the item count and total cost of a unique user's basket."""
+    validate_correct_user_or_admin(id=id, current_user=current_user)
+
+    return await get_basket_summary_async(db=db, user_id=id)
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_unique_user_basket_item(
+    id: int,
+    product_id: DeleteBasketProduct,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> None:
+    """Delete a unique product from unique user's basket."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    await remove_item_from_user_basket_async(
+        db=db, user_id=id, product_id=product_id.product_id
+    )
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_connection import get_async_db
+from src.database.models import Orders, Users
+from src.repository.authentication import get_current_user_async
+from src.repository.order import select_user_orders
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.routers.schemas.order import OrderBase
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["Orders"],
+)
+
+
+@router.get("", status_code=status.HTTP_200_OK, response_model=list[OrderBase])
+async def get_user_orders(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> list[OrderBase]:
+    """Get a page of the current user's orders, newest first, with the next cursor in a header."""
+    orders_query = paginate_query(
+        select_user_orders(
+            user_id=current_user.id,
+            created_after=created_after,
+            created_before=created_before,
+        ),
+        sort_column=Orders.created_at,
+        id_column=Orders.id,
+        limit=limit,
+        after=after,
+        descending=True,
+    )
+    result = await db.scalars(orders_query)
+    orders, next_cursor = split_page(
+        result.all(),
+        sort_column=Orders.created_at,
+        id_column=Orders.id,
+        limit=limit,
+    )
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return orders
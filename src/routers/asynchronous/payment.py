@@ -0,0 +1,36 @@
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Header, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_connection import get_async_db
+from src.database.models import Users
+from src.repository.authentication import get_current_user_async, validate_correct_user
+from src.repository.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH
+from src.repository.payment import check_out_user_basket_async
+from src.routers.schemas.payment import PaymentBase
+from src.routers.schemas.user import UserUnique
+
+load_dotenv()
+
+router = APIRouter(
+    prefix="/payment",
+    tags=["Payments"],
+)
+
+
+@router.post("/{id}", status_code=status.HTTP_200_OK, response_model=UserUnique)
+async def pay_for_unique_user_basket(
+    id: int,
+    payment: PaymentBase,
+    idempotency_key: str | None = Header(
+        None, alias="Idempotency-Key", max_length=IDEMPOTENCY_KEY_MAX_LENGTH
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> UserUnique:
+    """Pay for unique user's basket."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    return await check_out_user_basket_async(
+        db=db, user_id=id, payment=payment, idempotency_key=idempotency_key
+    )
@@ -0,0 +1,313 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache.product import (
+    get_catalogue_cache_key,
+    get_product_cache_key,
+    invalidate_cached_product,
+    product_cache,
+)
+from src.database.database_connection import get_async_db
+from src.database.models import Products, Users
+from src.repository.authentication import get_current_user_async, validate_user_as_admin
+from src.repository.basket import mark_basket_summaries_stale
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.product import (
+    does_product_exist_in_database,
+    select_products,
+    update_unique_product_async,
+)
+from src.repository.product_bulk import (
+    import_products_async,
+    read_bulk_rows,
+    update_products_in_bulk_async,
+)
+from src.repository.product_export import (
+    EXPORT_MEDIA_TYPES,
+    stream_product_export_async,
+)
+from src.routers.schemas.product import (
+    BulkProductResult,
+    BulkUpdateProductPrice,
+    BulkUpdateProductSalePercentage,
+    ExportFormat,
+    ProductAll,
+    ProductBase,
+    ProductCreate,
+    ProductSortKey,
+    ShowProductHotStatus,
+    ShowProductStock,
+    UpdateProductHotStatus,
+    UpdateProductPrice,
+    UpdateProductSalePercentage,
+    UpdateProductStock,
+)
+
+router = APIRouter(
+    prefix="/product",
+    tags=["Products"],
+)
+
+
+@router.get("/all", status_code=status.HTTP_200_OK, response_model=list[ProductAll])
+async def get_all_products(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    sort_by: ProductSortKey = ProductSortKey.id,
+    descending: bool = False,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    on_sale: bool | None = None,
+    in_stock: bool | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> list[ProductAll]:
+    """Get a page of products from database, with the next page's cursor in a header."""
+    cache_key = get_catalogue_cache_key(
+        limit=limit,
+        after=after,
+        sort_by=sort_by.value,
+        descending=descending,
+        min_price=min_price,
+        max_price=max_price,
+        on_sale=on_sale,
+        in_stock=in_stock,
+    )
+    page = product_cache.get(cache_key)
+
+    if page is None:
+        sort_column = getattr(Products, sort_by.value)
+        products_query = paginate_query(
+            select_products(
+                min_price=min_price,
+                max_price=max_price,
+                on_sale=on_sale,
+                in_stock=in_stock,
+            ),
+            sort_column=sort_column,
+            id_column=Products.id,
+            limit=limit,
+            after=after,
+            descending=descending,
+        )
+        result = await db.scalars(products_query)
+        products, next_cursor = split_page(
+            result.all(),
+            sort_column=sort_column,
+            id_column=Products.id,
+            limit=limit,
+        )
+        page = {
+            "products": [ProductAll.from_orm(product).dict() for product in products],
+            "next_cursor": next_cursor,
+        }
+        product_cache.set(cache_key, page)
+
+    if page["next_cursor"] is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+
+    return page["products"]
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_all_products(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> StreamingResponse:
+    """Stream every product in the database as NDJSON or CSV."""
+    return StreamingResponse(
+        stream_product_export_async(db=db, export_format=export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=products.{export_format.value}"
+        },
+    )
+
+
+@router.get("/{id}", status_code=status.HTTP_200_OK, response_model=ProductBase)
+async def get_unique_product(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ProductBase:
+    """Get a unique product from database."""
+    product = product_cache.get(get_product_cache_key(id))
+    if product is None:
+        product = await db.get(Products, id)
+        does_product_exist_in_database(product=product)
+        product = ProductBase.from_orm(product).dict()
+        product_cache.set(get_product_cache_key(id), product)
+
+    return product
+
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=ProductBase)
+async def create_new_product(
+    product: ProductCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ProductBase:
+    """Create a new product in the database."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    new_product = Products(name=product.name, price=product.price, stock=product.stock)
+    db.add(new_product)
+    await db.commit()
+    await db.refresh(new_product)
+    invalidate_cached_product()
+    return new_product
+
+
+@router.post("/bulk", status_code=status.HTTP_200_OK, response_model=BulkProductResult)
+async def create_new_products_in_bulk(
+    current_user: Users = Depends(get_current_user_async),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkProductResult:
+    """Create many products from a JSON array or CSV upload, reporting failed rows."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return await import_products_async(db=db, rows=rows)
+
+
+@router.put(
+    "/stock/{id}", status_code=status.HTTP_200_OK, response_model=ShowProductStock
+)
+async def increase_unique_product_stock(
+    id: int,
+    stock: UpdateProductStock,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ShowProductStock:
+    """Increase the stock of a unique product."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    updated_product = await update_unique_product_async(
+        db=db,
+        product_id=id,
+        new_values={"stock": Products.stock + stock.stock_increase},
+    )
+    invalidate_cached_product(id)
+    return updated_product
+
+
+@router.put("/price/{id}", status_code=status.HTTP_200_OK, response_model=ProductBase)
+async def update_unique_product_price(
+    id: int,
+    price: UpdateProductPrice,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ProductBase:
+    """Update price of a unique product."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    updated_product = await update_unique_product_async(
+        db=db, product_id=id, new_values={"price": price.new_price}
+    )
+    invalidate_cached_product(id)
+    return updated_product
+
+
+@router.put("/sale/{id}", status_code=status.HTTP_200_OK, response_model=ProductBase)
+async def put_unique_product_on_sale(
+    id: int,
+    sale: UpdateProductSalePercentage,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ProductBase:
+    """Update the sale percentage of a unique product."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    updated_product = await update_unique_product_async(
+        db=db, product_id=id, new_values={"sale_percentage": sale.sale_percentage}
+    )
+    invalidate_cached_product(id)
+    return updated_product
+
+
+@router.put(
+    "/bulk/price", status_code=status.HTTP_200_OK, response_model=BulkProductResult
+)
+async def update_product_prices_in_bulk(
+    current_user: Users = Depends(get_current_user_async),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkProductResult:
+    """Update the prices of many products from a JSON array or CSV upload."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return await update_products_in_bulk_async(
+        db=db,
+        rows=rows,
+        row_model=BulkUpdateProductPrice,
+        product_column=Products.price,
+        field="new_price",
+    )
+
+
+@router.put(
+    "/bulk/sale", status_code=status.HTTP_200_OK, response_model=BulkProductResult
+)
+async def put_products_on_sale_in_bulk(
+    current_user: Users = Depends(get_current_user_async),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkProductResult:
+    """Update the sale percentages of many products from a JSON array or CSV upload."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return await update_products_in_bulk_async(
+        db=db,
+        rows=rows,
+        row_model=BulkUpdateProductSalePercentage,
+        product_column=Products.sale_percentage,
+        field="sale_percentage",
+    )
+
+
+@router.put(
+    "/hot/{id}", status_code=status.HTTP_200_OK, response_model=ShowProductHotStatus
+)
+async def flag_unique_product_as_hot(
+    id: int,
+    hot: UpdateProductHotStatus,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> ShowProductHotStatus:
+    """Flag a unique product as hot, sharding its stock on the next stock flush."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    updated_product = await update_unique_product_async(
+        db=db, product_id=id, new_values={"is_hot": hot.is_hot}
+    )
+    return updated_product
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_unique_product(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> None:
+    """Delete a unique product."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    product = await db.get(Products, id)
+    does_product_exist_in_database(product=product)
+
+    await db.execute(mark_basket_summaries_stale(product_ids=[id]))
+    await db.execute(delete(Products).where(Products.id == id))
+    await db.commit()
+    invalidate_cached_product(id)
@@ -0,0 +1,130 @@
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.cache.authentication import invalidate_cached_user
+from src.database.database_connection import get_async_db
+from src.database.models import Users
+from src.database.password_hashing import ConfiguredHasher
+from src.repository.authentication import (
+    get_current_user_async,
+    validate_correct_user,
+    validate_correct_user_or_admin,
+    validate_user_as_admin,
+)
+from src.repository.hashing_pool import password_hashing_pool
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.user import does_user_already_exist, update_unique_user_async
+from src.routers.schemas.user import UserBase, UserCreate, UserUnique, UserUpdate
+
+load_dotenv()
+
+router = APIRouter(
+    prefix="/user",
+    tags=["Users"],
+)
+
+
+@router.get("/all", status_code=status.HTTP_200_OK, response_model=list[UserBase])
+async def get_all_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> list[UserBase]:
+    """Get a page of users from database, with the next page's cursor in a header."""
+    validate_user_as_admin(current_user_email=current_user.email)
+    users_query = paginate_query(
+        select(Users),
+        sort_column=Users.id,
+        id_column=Users.id,
+        limit=limit,
+        after=after,
+    )
+    result = await db.scalars(users_query)
+    users, next_cursor = split_page(
+        result.all(), sort_column=Users.id, id_column=Users.id, limit=limit
+    )
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return users
+
+
+@router.get("/{id}", status_code=status.HTTP_200_OK, response_model=UserUnique)
+async def get_unique_user(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> UserUnique:
+    """Get a unique user from database."""
+    validate_correct_user_or_admin(id=id, current_user=current_user)
+    user = await db.scalar(
+        select(Users).options(selectinload(Users.basket_items)).where(Users.id == id)
+    )
+    return user
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserBase)
+async def create_new_user(
+    new_user: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> UserBase:
+    """Create a new product in the database."""
+    user = await db.scalar(select(Users).where(Users.email == new_user.email))
+    does_user_already_exist(user=user)
+
+    password_hasher = ConfiguredHasher()
+    hashed_password = await password_hashing_pool.run_async(
+        password_hasher.get_hashed_password, new_user.password
+    )
+    new_user_to_add = Users(
+        name=new_user.name, email=new_user.email, hashed_password=hashed_password
+    )
+    db.add(new_user_to_add)
+    await db.commit()
+    await db.refresh(new_user_to_add)
+    return new_user_to_add
+
+
+@router.put("/{id}", status_code=status.HTTP_200_OK, response_model=UserBase)
+async def update_unique_user_information(
+    id: int,
+    user_update: UserUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> UserBase:
+    """Update basic user information."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    updated_user = await update_unique_user_async(
+        db=db,
+        user_id=id,
+        new_values={"name": user_update.name, "email": user_update.email},
+    )
+    invalidate_cached_user(id)
+    return updated_user
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_unique_user(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+) -> None:
+    """Delete a unique user."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    await db.execute(delete(Users).where(Users.id == id))
+    await db.commit()
+    invalidate_cached_user(id)
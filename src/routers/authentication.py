@@ -1,24 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from src.database.database_connection import get_db
 from src.database.models import Users
-from src.database.password_hashing import verify_login_password
+from src.database.password_hashing import verify_and_update_login_password
 from src.repository.authentication import create_encoded_jwt_access_token
+from src.repository.hashing_pool import password_hashing_pool
+from src.repository.rate_limiting import limit_login_attempts
 from src.routers.schemas.authentication import Token
 
 router = APIRouter(tags=["Authentication"])
 
 
-@router.post("/login", response_model=Token)
-def user_login(
+@router.post(
+    "/login", response_model=Token, dependencies=[Depends(limit_login_attempts)]
+)
+async def user_login(
     user_credentials: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ) -> Token:
-    """Validate a user login."""
+    """Validate a user login, hashing off the event loop without holding a thread."""
     user_query = db.query(Users).filter(Users.email == user_credentials.username)
-    user = user_query.first()
+    user = await run_in_threadpool(user_query.first)
 
     if not user:
         raise HTTPException(
@@ -26,12 +31,22 @@ def user_login(
             detail="invalid credentials",
         )
 
-    if not verify_login_password(user_credentials.password, user.hashed_password):
+    is_password_correct, rehashed_password = await password_hashing_pool.run_async(
+        verify_and_update_login_password,
+        user_credentials.password,
+        user.hashed_password,
+    )
+
+    if not is_password_correct:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="invalid credentials",
         )
 
+    if rehashed_password is not None:
+        user.hashed_password = rehashed_password
+        await run_in_threadpool(db.commit)
+
     encoded_jwt_access_token = create_encoded_jwt_access_token(
         data={"user_id": user.id}
     )
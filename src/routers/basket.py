@@ -1,17 +1,38 @@
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.database.database_connection import get_db
-from src.database.models import Baskets, Products, Users
+from src.database.models import Baskets, Users
 from src.repository.authentication import (
     get_current_user,
     validate_correct_user,
     validate_correct_user_or_admin,
 )
-from src.repository.basket import does_product_exist_in_user_basket
-from src.repository.product import does_product_exist_in_database, is_there_enough_stock
-from src.routers.schemas.basket import BasketCreate, BasketsBase, DeleteBasketProduct
+from src.repository.basket import (
+    add_item_to_user_basket,
+    get_basket_summary,
+    get_user_basket_summary,
+    remove_item_from_user_basket,
+)
+from src.repository.basket_operations import apply_basket_operations
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.product import reserve_product_stock
+from src.repository.stock_shards import hot_stock
+from src.routers.schemas.basket import (
+    BasketCreate,
+    BasketsBase,
+    BasketSummary,
+    BulkBasketUpdate,
+    DeleteBasketProduct,
+)
 
 load_dotenv()
 
@@ -23,11 +44,30 @@ router = APIRouter(
 
 @router.get("/all", status_code=status.HTTP_200_OK, response_model=list[BasketsBase])
 def get_all_basket_items(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ) -> list[BasketsBase]:
-    """Get all basket items from database."""
-    basket_items = db.query(Baskets).filter(Baskets.user_id == current_user.id).all()
+    """Get a page of basket items from database, with the next page's cursor in a header."""
+    basket_items_query = paginate_query(
+        select(Baskets).where(Baskets.user_id == current_user.id),
+        sort_column=Baskets.id,
+        id_column=Baskets.id,
+        limit=limit,
+        after=after,
+    )
+    basket_items, next_cursor = split_page(
+        db.scalars(basket_items_query).all(),
+        sort_column=Baskets.id,
+        id_column=Baskets.id,
+        limit=limit,
+    )
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
     return basket_items
 
 
@@ -41,45 +81,46 @@ def create_new_basket_item(
     """Create a new basket item."""
     validate_correct_user(id=id, current_user_id=current_user.id)
 
-    product_query = db.query(Products).filter(Products.id == new_item.product_id)
-    product = product_query.first()
-    does_product_exist_in_database(product=product)
-
-    is_there_enough_stock(
-        quantity_purchased=new_item.quantity,
-        amount_of_stock=product.stock,
-    )
-
-    basket_item_query = (
-        db.query(Baskets)
-        .filter(Baskets.user_id == id)
-        .filter(Baskets.product_id == new_item.product_id)
-    )
-    basket_item = basket_item_query.first()
-
-    if basket_item is None:
-        new_basket_item = Baskets(
-            user_id=id,
+    hot_stock_counter = hot_stock.get_counter(product_id=new_item.product_id)
+    if hot_stock_counter is None:
+        reserve_product_stock(
+            db=db,
             product_id=new_item.product_id,
             quantity=new_item.quantity,
         )
-        db.add(new_basket_item)
-        product_query.update({"stock": product.stock - new_item.quantity})
-        db.commit()
-        db.refresh(new_basket_item)
-        return new_basket_item
-
     else:
-        basket_item_query.update({"quantity": basket_item.quantity + new_item.quantity})
-        product_query.update({"stock": product.stock - new_item.quantity})
-        db.commit()
-        basket_item_query = (
-            db.query(Baskets)
-            .filter(Baskets.user_id == id)
-            .filter(Baskets.product_id == new_item.product_id)
+        hot_stock_counter.reserve(quantity=new_item.quantity)
+
+    try:
+        return add_item_to_user_basket(
+            db=db,
+            user_id=id,
+            new_item=new_item,
+            is_hot_product=hot_stock_counter is not None,
         )
-        updated_basket_item = basket_item_query.first()
-        return updated_basket_item
+    except Exception:
+        if hot_stock_counter is not None:
+            hot_stock_counter.release(quantity=new_item.quantity)
+        raise
+
+
+@router.post(
+    "/{id}/bulk", status_code=status.HTTP_200_OK, response_model=list[BasketsBase]
+)
+def update_unique_user_basket_in_bulk(
+    id: int,
+    basket_update: BulkBasketUpdate,
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+) -> list[BasketsBase]:
+    """Add, remove and set the quantity of many basket items in one transaction."""
+    validate_correct_user(id=id, current_user_id=current_user.id)
+
+    apply_basket_operations(db=db, user_id=id, operations=basket_update.operations)
+    basket_items = db.scalars(
+        select(Baskets).where(Baskets.user_id == id).order_by(Baskets.id)
+    )
+    return basket_items.all()
 
 
 @router.get("/{id}", status_code=status.HTTP_200_OK)
@@ -91,34 +132,21 @@ def get_unique_user_basket_information(
     """Get detailed basket info for a unique user."""
     validate_correct_user_or_admin(id=id, current_user=current_user)
 
-    total_basket_items = 0
-    total_basket_cost = 0
-    basket_info_dict = {
-        "user_id": id,
-        "items": [],
-        "total_items_in_basket": 0,
-        "total_cost_of_basket": 0,
-    }
+    return get_user_basket_summary(db=db, user_id=id)
 
-    basket_query = db.query(Baskets).filter(Baskets.user_id == id).all()
 
-    for item in basket_query:
-        product_query = (
-            db.query(Products).filter(Products.id == item.product_id).first()
-        )
-        product_name = product_query.name
-        product_quantity = item.quantity
-        total_basket_cost += (
-            product_query.price
-            - product_query.price * (product_query.sale_percentage / 100)
-        ) * product_quantity
-        total_basket_items += product_quantity
-        product_dict = {"product": product_name, "quantity": product_quantity}
-        basket_info_dict["items"].append(product_dict)
-        basket_info_dict["total_items_in_basket"] = total_basket_items
-        basket_info_dict["total_cost_of_basket"] = total_basket_cost
+@router.get(
+    "/{id}/summary", status_code=status.HTTP_200_OK, response_model=BasketSummary
+)
+def get_unique_user_basket_summary(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+) -> BasketSummary:
+    """Get the item count and total cost of a unique user's basket."""
+    validate_correct_user_or_admin(id=id, current_user=current_user)
 
-    return basket_info_dict
+    return get_basket_summary(db=db, user_id=id)
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -131,12 +159,4 @@ def delete_unique_user_basket_item(
     """Delete a unique product from unique user's basket."""
     validate_correct_user(id=id, current_user_id=current_user.id)
 
-    basket_query = db.query(Baskets).filter(Baskets.user_id == id)
-    basket_product_query = basket_query.filter(
-        Baskets.product_id == product_id.product_id
-    )
-    basket_product = basket_product_query.first()
-    does_product_exist_in_user_basket(basket_product=basket_product)
-
-    basket_product_query.delete(synchronize_session=False)
-    db.commit()
+    remove_item_from_user_basket(db=db, user_id=id, product_id=product_id.product_id)
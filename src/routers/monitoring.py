@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from src.database.database_connection import async_engine, engine, is_database_ready
+from src.database.pool import get_pool_metrics
+from src.monitoring.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Monitoring"],
+)
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["Monitoring"],
+)
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def get_readiness() -> dict:
+    """Check the API can reach the database."""
+    if not await run_in_threadpool(is_database_ready):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="database is not ready",
+        )
+
+    return {"database": "ok"}
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_connection_pool_metrics() -> dict:
+    """Get usage and checkout wait times of the database connection pools."""
+    return {
+        "sync": get_pool_metrics(engine.pool),
+        "async": get_pool_metrics(async_engine.pool),
+    }
+
+
+@metrics_router.get("", status_code=status.HTTP_200_OK)
+async def get_request_metrics() -> PlainTextResponse:
+    """Get request latencies and database query counts in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,15 +1,49 @@
-from fastapi import APIRouter, Depends, status
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.cache.product import (
+    get_catalogue_cache_key,
+    get_product_cache_key,
+    invalidate_cached_product,
+    product_cache,
+)
 from src.database.database_connection import get_db
 from src.database.models import Products, Users
 from src.repository.authentication import get_current_user, validate_user_as_admin
-from src.repository.product import does_product_exist_in_database
+from src.repository.basket import mark_basket_summaries_stale
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.product import (
+    does_product_exist_in_database,
+    select_products,
+    update_unique_product,
+)
+from src.repository.product_bulk import (
+    import_products,
+    read_bulk_rows,
+    update_products_in_bulk,
+)
+from src.repository.product_export import EXPORT_MEDIA_TYPES, stream_product_export
 from src.routers.schemas.product import (
+    BulkProductResult,
+    BulkUpdateProductPrice,
+    BulkUpdateProductSalePercentage,
+    ExportFormat,
     ProductAll,
     ProductBase,
     ProductCreate,
+    ProductSortKey,
+    ShowProductHotStatus,
     ShowProductStock,
+    UpdateProductHotStatus,
     UpdateProductPrice,
     UpdateProductSalePercentage,
     UpdateProductStock,
@@ -23,12 +57,78 @@ router = APIRouter(
 
 @router.get("/all", status_code=status.HTTP_200_OK, response_model=list[ProductAll])
 def get_all_products(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    sort_by: ProductSortKey = ProductSortKey.id,
+    descending: bool = False,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    on_sale: bool | None = None,
+    in_stock: bool | None = None,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ) -> list[ProductAll]:
-    """Get all products from database."""
-    products = db.query(Products).all()
-    return products
+    """Get a page of products from database, with the next page's cursor in a header."""
+    cache_key = get_catalogue_cache_key(
+        limit=limit,
+        after=after,
+        sort_by=sort_by.value,
+        descending=descending,
+        min_price=min_price,
+        max_price=max_price,
+        on_sale=on_sale,
+        in_stock=in_stock,
+    )
+    page = product_cache.get(cache_key)
+
+    if page is None:
+        sort_column = getattr(Products, sort_by.value)
+        products_query = paginate_query(
+            select_products(
+                min_price=min_price,
+                max_price=max_price,
+                on_sale=on_sale,
+                in_stock=in_stock,
+            ),
+            sort_column=sort_column,
+            id_column=Products.id,
+            limit=limit,
+            after=after,
+            descending=descending,
+        )
+        products, next_cursor = split_page(
+            db.scalars(products_query).all(),
+            sort_column=sort_column,
+            id_column=Products.id,
+            limit=limit,
+        )
+        page = {
+            "products": [ProductAll.from_orm(product).dict() for product in products],
+            "next_cursor": next_cursor,
+        }
+        product_cache.set(cache_key, page)
+
+    if page["next_cursor"] is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+
+    return page["products"]
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+def export_all_products(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream every product in the database as NDJSON or CSV."""
+    return StreamingResponse(
+        stream_product_export(db=db, export_format=export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=products.{export_format.value}"
+        },
+    )
 
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=ProductBase)
@@ -38,9 +138,13 @@ def get_unique_product(
     current_user: Users = Depends(get_current_user),
 ) -> ProductBase:
     """Get a unique product from database."""
-    product_query = db.query(Products).filter(Products.id == id)
-    product = product_query.first()
-    does_product_exist_in_database(product=product)
+    product = product_cache.get(get_product_cache_key(id))
+    if product is None:
+        product_query = db.query(Products).filter(Products.id == id)
+        product = product_query.first()
+        does_product_exist_in_database(product=product)
+        product = ProductBase.from_orm(product).dict()
+        product_cache.set(get_product_cache_key(id), product)
 
     return product
 
@@ -58,9 +162,22 @@ def create_new_product(
     db.add(new_product)
     db.commit()
     db.refresh(new_product)
+    invalidate_cached_product()
     return new_product
 
 
+@router.post("/bulk", status_code=status.HTTP_200_OK, response_model=BulkProductResult)
+def create_new_products_in_bulk(
+    current_user: Users = Depends(get_current_user),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: Session = Depends(get_db),
+) -> BulkProductResult:
+    """Create many products from a JSON array or CSV upload, reporting failed rows."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return import_products(db=db, rows=rows)
+
+
 @router.put(
     "/stock/{id}", status_code=status.HTTP_200_OK, response_model=ShowProductStock
 )
@@ -73,13 +190,12 @@ def increase_unique_product_stock(
     """Increase the stock of a unique product."""
     validate_user_as_admin(current_user_email=current_user.email)
 
-    product_query = db.query(Products).filter(Products.id == id)
-    product = product_query.first()
-    does_product_exist_in_database(product=product)
-    updated_stock = product.stock + stock.stock_increase
-    product_query.update({"stock": updated_stock})
-    db.commit()
-    updated_product = db.query(Products).filter(Products.id == id).first()
+    updated_product = update_unique_product(
+        db=db,
+        product_id=id,
+        new_values={"stock": Products.stock + stock.stock_increase},
+    )
+    invalidate_cached_product(id)
     return updated_product
 
 
@@ -93,13 +209,10 @@ def update_unique_product_price(
     """Update price of a unique product."""
     validate_user_as_admin(current_user_email=current_user.email)
 
-    product_query = db.query(Products).filter(Products.id == id)
-    product = product_query.first()
-    does_product_exist_in_database(product=product)
-
-    product_query.update({"price": price.new_price})
-    db.commit()
-    updated_product = db.query(Products).filter(Products.id == id).first()
+    updated_product = update_unique_product(
+        db=db, product_id=id, new_values={"price": price.new_price}
+    )
+    invalidate_cached_product(id)
     return updated_product
 
 
@@ -113,13 +226,68 @@ def put_unique_product_on_sale(
     """Update the sale percentage of a unique product."""
     validate_user_as_admin(current_user_email=current_user.email)
 
-    product_query = db.query(Products).filter(Products.id == id)
-    product = product_query.first()
-    does_product_exist_in_database(product=product)
+    updated_product = update_unique_product(
+        db=db, product_id=id, new_values={"sale_percentage": sale.sale_percentage}
+    )
+    invalidate_cached_product(id)
+    return updated_product
 
-    product_query.update({"sale_percentage": sale.sale_percentage})
-    db.commit()
-    updated_product = db.query(Products).filter(Products.id == id).first()
+
+@router.put(
+    "/bulk/price", status_code=status.HTTP_200_OK, response_model=BulkProductResult
+)
+def update_product_prices_in_bulk(
+    current_user: Users = Depends(get_current_user),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: Session = Depends(get_db),
+) -> BulkProductResult:
+    """Update the prices of many products from a JSON array or CSV upload."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return update_products_in_bulk(
+        db=db,
+        rows=rows,
+        row_model=BulkUpdateProductPrice,
+        product_column=Products.price,
+        field="new_price",
+    )
+
+
+@router.put(
+    "/bulk/sale", status_code=status.HTTP_200_OK, response_model=BulkProductResult
+)
+def put_products_on_sale_in_bulk(
+    current_user: Users = Depends(get_current_user),
+    rows: list[dict] = Depends(read_bulk_rows),
+    db: Session = Depends(get_db),
+) -> BulkProductResult:
+    """Update the sale percentages of many products from a JSON array or CSV upload."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    return update_products_in_bulk(
+        db=db,
+        rows=rows,
+        row_model=BulkUpdateProductSalePercentage,
+        product_column=Products.sale_percentage,
+        field="sale_percentage",
+    )
+
+
+@router.put(
+    "/hot/{id}", status_code=status.HTTP_200_OK, response_model=ShowProductHotStatus
+)
+def flag_unique_product_as_hot(
+    id: int,
+    hot: UpdateProductHotStatus,
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+) -> ShowProductHotStatus:
+    """Flag a unique product as hot, sharding its stock on the next stock flush."""
+    validate_user_as_admin(current_user_email=current_user.email)
+
+    updated_product = update_unique_product(
+        db=db, product_id=id, new_values={"is_hot": hot.is_hot}
+    )
     return updated_product
 
 
@@ -136,5 +304,7 @@ def delete_unique_product(
     product = product_query.first()
     does_product_exist_in_database(product=product)
 
+    db.execute(mark_basket_summaries_stale(product_ids=[id]))
     product_query.delete(synchronize_session=False)
     db.commit()
+    invalidate_cached_product(id)
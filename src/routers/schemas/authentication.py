@@ -14,3 +14,15 @@ class TokenData(BaseModel):
     """Pydantic model for data within payload of a jwt access token."""
 
     id: Optional[str] = None
+
+
+class UserPrincipal(BaseModel):
+    """Pydantic model for the verified user making a request."""
+
+    id: int
+    email: str
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from src.database.money import MoneyAmount
 
 
 class BasketsBase(BaseModel):
@@ -22,6 +26,27 @@ class BasketsBase(BaseModel):
         }
 
 
+class BasketSummary(BaseModel):
+    """Pydantic model for showing the totals of a user's basket."""
+
+    user_id: int
+    total_items: int
+    total_cost: MoneyAmount
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "user_id": 4,
+                "total_items": 7,
+                "total_cost": 12500.50,
+            }
+        }
+
+
 class DeleteBasketProduct(BaseModel):
     """Pydantic model for deleting product from a user basket."""
 
@@ -68,3 +93,47 @@ class BasketCreate(BaseModel):
         orm_mode = True
 
         schema_extra = {"example": {"product_id": 3, "quantity": 30}}
+
+
+class BasketOperationType(str, Enum):
+    """Changes that can be made to a basket item in a bulk basket update."""
+
+    add = "add"
+    remove = "remove"
+    set = "set"
+
+
+class BasketOperation(BaseModel):
+    """Pydantic model for one change in a bulk basket update."""
+
+    operation: BasketOperationType
+    product_id: int
+    quantity: int = Field(0, ge=0)
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {"example": {"operation": "add", "product_id": 3, "quantity": 2}}
+
+
+class BulkBasketUpdate(BaseModel):
+    """Pydantic model for changes applied to a basket in one transaction."""
+
+    operations: list[BasketOperation] = Field(..., min_items=1, max_items=1000)
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "operations": [
+                    {"operation": "add", "product_id": 3, "quantity": 2},
+                    {"operation": "set", "product_id": 4, "quantity": 5},
+                    {"operation": "remove", "product_id": 7},
+                ]
+            }
+        }
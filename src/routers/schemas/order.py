@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from src.database.money import MoneyAmount
+
+
+class OrderLineBase(BaseModel):
+    """Pydantic model for showing a product bought in an order."""
+
+    product_id: int | None
+    product_name: str
+    unit_price: MoneyAmount
+    quantity: int
+    total_cost: MoneyAmount
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "product_id": 3,
+                "product_name": "Headphones",
+                "unit_price": 1500,
+                "quantity": 2,
+                "total_cost": 3000,
+            }
+        }
+
+
+class OrderBase(BaseModel):
+    """Pydantic model for showing an order and the products bought in it."""
+
+    id: int
+    total_cost: MoneyAmount
+    coupons_used: int
+    created_at: datetime
+    lines: list[OrderLineBase]
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "id": 12,
+                "total_cost": 3000,
+                "coupons_used": 1,
+                "created_at": "2023-06-26T11:00:00+00:00",
+                "lines": [
+                    {
+                        "product_id": 3,
+                        "product_name": "Headphones",
+                        "unit_price": 1500,
+                        "quantity": 2,
+                        "total_cost": 3000,
+                    }
+                ],
+            }
+        }
@@ -1,10 +1,12 @@
 from pydantic import BaseModel
 
+from src.database.money import MoneyAmount
+
 
 class PaymentBase(BaseModel):
     """Pydantic model for payment details."""
 
-    payment_amount: float
+    payment_amount: MoneyAmount
     coupons_to_use: int
 
     class Config:
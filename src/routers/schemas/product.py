@@ -1,11 +1,33 @@
+from enum import Enum
+
 from pydantic import BaseModel
 
+from src.database.money import MoneyAmount
+
+
+class ExportFormat(str, Enum):
+    """Formats the product catalogue can be exported in."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ProductSortKey(str, Enum):
+    """Columns the product catalogue can be sorted by."""
+
+    id = "id"
+    name = "name"
+    price = "price"
+    effective_price = "effective_price"
+    stock = "stock"
+
 
 class ProductBase(BaseModel):
     """Pydantic model for showing basic product information."""
 
     name: str
-    price: float
+    price: MoneyAmount
+    effective_price: MoneyAmount
     stock: int
     sale_percentage: int
 
@@ -18,6 +40,7 @@ class ProductBase(BaseModel):
             "example": {
                 "name": "Apple MacBook Pro M2",
                 "price": 45000,
+                "effective_price": 33750,
                 "stock": 250,
                 "sale_percentage": 25,
             }
@@ -28,7 +51,7 @@ class ProductCreate(BaseModel):
     """Pydantic model for creating a new product."""
 
     name: str
-    price: float
+    price: MoneyAmount
     stock: int
 
     class Config:
@@ -95,7 +118,7 @@ class UpdateProductStock(BaseModel):
 class UpdateProductPrice(BaseModel):
     """Pydantic model for updating price of products."""
 
-    new_price: float
+    new_price: MoneyAmount
 
     class Config:
         """ORM config class."""
@@ -124,3 +147,91 @@ class UpdateProductSalePercentage(BaseModel):
                 "sale_percentage": 25,
             }
         }
+
+
+class ShowProductHotStatus(BaseModel):
+    """Pydantic model for showing whether a product is flagged as hot."""
+
+    name: str
+    is_hot: bool
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "name": "Apple iPhone 14 Pro",
+                "is_hot": True,
+            }
+        }
+
+
+class UpdateProductHotStatus(BaseModel):
+    """Pydantic model for flagging products as hot during flash sales."""
+
+    is_hot: bool
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "is_hot": True,
+            }
+        }
+
+
+class BulkUpdateProductPrice(UpdateProductPrice):
+    """Pydantic model for one row of a bulk update of product prices."""
+
+    id: int
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {"example": {"id": 3, "new_price": 30000}}
+
+
+class BulkUpdateProductSalePercentage(UpdateProductSalePercentage):
+    """Pydantic model for one row of a bulk update of product sale percentages."""
+
+    id: int
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {"example": {"id": 3, "sale_percentage": 25}}
+
+
+class BulkProductRowError(BaseModel):
+    """Pydantic model for a row of a bulk product upload that was not applied."""
+
+    row: int
+    detail: str
+
+
+class BulkProductResult(BaseModel):
+    """Pydantic model for the outcome of a bulk product upload."""
+
+    succeeded: int
+    errors: list[BulkProductRowError]
+
+    class Config:
+        """ORM config class."""
+
+        orm_mode = True
+
+        schema_extra = {
+            "example": {
+                "succeeded": 99999,
+                "errors": [{"row": 42, "detail": "product does not exist"}],
+            }
+        }
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+from src.database.money import MoneyAmount
 from src.routers.schemas.basket import BasketProduct
 
 
@@ -9,7 +10,7 @@ class UserBase(BaseModel):
     id: int
     name: str
     email: str
-    total_spent_overall: float
+    total_spent_overall: MoneyAmount
     coupon_count: int
 
     class Config:
@@ -72,7 +73,7 @@ class UserUnique(BaseModel):
 
     name: str
     email: str
-    total_spent_overall: float
+    total_spent_overall: MoneyAmount
     coupon_count: int
     basket_items: list[BasketProduct]
 
@@ -1,17 +1,28 @@
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from src.cache.authentication import invalidate_cached_user
 from src.database.database_connection import get_db
 from src.database.models import Users
-from src.database.password_hashing import Bcrypt
+from src.database.password_hashing import ConfiguredHasher
 from src.repository.authentication import (
     get_current_user,
     validate_correct_user,
     validate_correct_user_or_admin,
     validate_user_as_admin,
 )
-from src.repository.user import does_user_already_exist
+from src.repository.hashing_pool import password_hashing_pool
+from src.repository.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    paginate_query,
+    split_page,
+)
+from src.repository.user import does_user_already_exist, update_unique_user
 from src.routers.schemas.user import UserBase, UserCreate, UserUnique, UserUpdate
 
 load_dotenv()
@@ -24,12 +35,30 @@ router = APIRouter(
 
 @router.get("/all", status_code=status.HTTP_200_OK, response_model=list[UserBase])
 def get_all_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
     db: Session = Depends(get_db),
     current_user: int = Depends(get_current_user),
 ) -> list[UserBase]:
-    """Get all users from database."""
+    """Get a page of users from database, with the next page's cursor in a header."""
     validate_user_as_admin(current_user_email=current_user.email)
-    users = db.query(Users).all()
+    users_query = paginate_query(
+        select(Users),
+        sort_column=Users.id,
+        id_column=Users.id,
+        limit=limit,
+        after=after,
+    )
+    users, next_cursor = split_page(
+        db.scalars(users_query).all(),
+        sort_column=Users.id,
+        id_column=Users.id,
+        limit=limit,
+    )
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return users
 
@@ -48,23 +77,25 @@ def get_unique_user(
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserBase)
-def create_new_user(
+async def create_new_user(
     new_user: UserCreate,
     db: Session = Depends(get_db),
 ) -> UserBase:
     """Create a new product in the database."""
     user_query = db.query(Users).filter(Users.email == new_user.email)
-    user = user_query.first()
+    user = await run_in_threadpool(user_query.first)
     does_user_already_exist(user=user)
 
-    bcrypt_hasher = Bcrypt()
-    hashed_password = bcrypt_hasher.get_hashed_password(new_user.password)
+    password_hasher = ConfiguredHasher()
+    hashed_password = await password_hashing_pool.run_async(
+        password_hasher.get_hashed_password, new_user.password
+    )
     new_user_to_add = Users(
         name=new_user.name, email=new_user.email, hashed_password=hashed_password
     )
     db.add(new_user_to_add)
-    db.commit()
-    db.refresh(new_user_to_add)
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, new_user_to_add)
     return new_user_to_add
 
 
@@ -78,11 +109,12 @@ def update_unique_user_information(
     """Update basic user information."""
     validate_correct_user(id=id, current_user_id=current_user.id)
 
-    user_query = db.query(Users).filter(Users.id == id)
-    user_query.update({"name": user_update.name, "email": user_update.email})
-    db.commit()
-
-    updated_user = db.query(Users).filter(Users.id == id).first()
+    updated_user = update_unique_user(
+        db=db,
+        user_id=id,
+        new_values={"name": user_update.name, "email": user_update.email},
+    )
+    invalidate_cached_user(id)
     return updated_user
 
 
@@ -95,7 +127,6 @@ def delete_unique_user(
     """Delete a unique user."""
     validate_correct_user(id=id, current_user_id=current_user.id)
 
-    user_query = db.query(Users).filter(Users.id == id)
-    user = user_query.first()
-    user.delete(synchronize_session=False)
+    db.execute(delete(Users).where(Users.id == id))
     db.commit()
+    invalidate_cached_user(id)
@@ -2,7 +2,13 @@ import os
 
 import jwt
 import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
 
+from src.database.models import Users
+from src.database.password_hashing import pwd_cxt, verify_and_update_login_password
+from src.repository.hashing_pool import PasswordHashingPool
+from src.repository.rate_limiting import LOGIN_EMAIL_BURST
 from src.routers.schemas.authentication import Token
 
 
@@ -55,3 +61,94 @@ def test_multiple_incorrect_user_logins(
         },
     )
     assert response.status_code == status_code
+
+
+def test_current_user_is_cached_until_user_is_updated(
+    authorized_client: callable, test_user: callable, recorded_statements: list[str]
+) -> None:
+    """Tests authenticated requests only look up the user again after it changes."""
+
+    def count_user_lookups() -> int:
+        """Counts the recorded statements that select from the users table."""
+        return len(
+            [
+                statement
+                for statement in recorded_statements
+                if statement.startswith("SELECT") and "FROM users" in statement
+            ]
+        )
+
+    recorded_statements.clear()
+    assert authorized_client.get("/basket/all").status_code == 200
+    assert authorized_client.get("/basket/all").status_code == 200
+    assert count_user_lookups() == 1
+
+    response = authorized_client.put(
+        f"/user/{test_user['id']}",
+        json={"name": test_user["name"], "email": "stephen@example.com"},
+    )
+    assert response.status_code == 200
+    user_lookup_count = count_user_lookups()
+
+    assert authorized_client.get("/basket/all").status_code == 200
+    assert count_user_lookups() == user_lookup_count + 1
+
+
+def test_full_password_hashing_pool_turns_requests_away() -> None:
+    """Tests password requests get a 503 once every slot in the pool is taken."""
+    hashing_pool = PasswordHashingPool(workers=0, queue_size=0)
+    hashing_pool.acquire_slot()
+
+    with pytest.raises(HTTPException) as error:
+        hashing_pool.run(
+            verify_and_update_login_password, "password", "hashed password"
+        )
+    assert error.value.status_code == 503
+
+    hashing_pool.slots.release()
+    assert hashing_pool.run(len, "password") == len("password")
+
+
+@pytest.mark.parametrize(
+    "outdated_context",
+    [
+        CryptContext(schemes=["bcrypt"], bcrypt__rounds=4),
+        CryptContext(schemes=["scrypt"], scrypt__rounds=4),
+    ],
+)
+def test_outdated_password_hash_is_rehashed_on_login(
+    client: callable, session: callable, outdated_context: CryptContext
+) -> None:
+    """Tests users with an outdated hash can log in and have it rehashed."""
+    outdated_hash = outdated_context.hash("password")
+    user = Users(
+        name="Old Hash", email="oldhash@example.com", hashed_password=outdated_hash
+    )
+    session.add(user)
+    session.commit()
+
+    response = client.post(
+        "/login", data={"username": "oldhash@example.com", "password": "password"}
+    )
+    assert response.status_code == 200
+
+    user = session.query(Users).filter(Users.email == "oldhash@example.com").first()
+    assert user.hashed_password != outdated_hash
+    assert not pwd_cxt.needs_update(user.hashed_password)
+    assert pwd_cxt.verify("password", user.hashed_password)
+
+
+def test_login_attempts_beyond_email_limit_are_rejected(
+    client: callable, test_user: callable, recorded_statements: list[str]
+) -> None:
+    """Tests repeated logins for one email are turned away before any query runs."""
+    credentials = {"username": test_user["email"], "password": "wrongpassword"}
+    for _ in range(LOGIN_EMAIL_BURST):
+        assert client.post("/login", data=credentials).status_code == 403
+
+    recorded_statements.clear()
+    response = client.post("/login", data=credentials)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert recorded_statements == []
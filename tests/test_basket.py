@@ -0,0 +1,216 @@
+import pytest
+from sqlalchemy import select
+
+from src.database.models import BasketSummaries, Products
+from src.database.money import round_money
+from src.repository.stock_shards import ShardedStockCounter, hot_stock
+from tests.conftest import TestingSessionLocal
+
+
+def test_basket_information_query_count_is_constant(
+    authorized_client: callable,
+    test_user: callable,
+    test_products: callable,
+    recorded_statements: list[str],
+) -> None:
+    """Tests the basket summary uses the same number of queries however big it gets."""
+
+    def add_to_basket(products: list) -> None:
+        """Adds one of each product to the test user's basket."""
+        for product in products:
+            response = authorized_client.post(
+                f"/basket/{test_user['id']}",
+                json={"product_id": product["id"], "quantity": 1},
+            )
+            assert response.status_code == 201
+
+    def get_basket_information() -> dict:
+        """Gets the basket summary while counting the statements it runs."""
+        authorized_client.get(f"/basket/{test_user['id']}")
+        recorded_statements.clear()
+        response = authorized_client.get(f"/basket/{test_user['id']}")
+        assert response.status_code == 200
+        return response.json()
+
+    add_to_basket(test_products[:1])
+    small_basket = get_basket_information()
+    small_basket_statement_count = len(recorded_statements)
+
+    add_to_basket(test_products[1:])
+    large_basket = get_basket_information()
+    large_basket_statement_count = len(recorded_statements)
+
+    assert small_basket["total_items_in_basket"] == 1
+    assert large_basket["total_items_in_basket"] == len(test_products)
+    assert large_basket["total_cost_of_basket"] == float(
+        sum(
+            round_money(product["price"] * (100 - product["sale_percentage"]) / 100)
+            for product in test_products
+        )
+    )
+    assert small_basket_statement_count == large_basket_statement_count
+
+
+def test_adding_a_product_twice_increases_one_basket_item(
+    authorized_client: callable,
+    test_user: callable,
+    test_products: callable,
+    recorded_statements: list[str],
+) -> None:
+    """Tests repeat adds of a product are merged into one item in a single statement."""
+    product = test_products[0]
+    recorded_statements.clear()
+
+    for quantity in [2, 3]:
+        response = authorized_client.post(
+            f"/basket/{test_user['id']}",
+            json={"product_id": product["id"], "quantity": quantity},
+        )
+        assert response.status_code == 201
+
+    assert response.json()["quantity"] == 5
+    basket_inserts = [
+        s for s in recorded_statements if s.startswith("INSERT INTO baskets")
+    ]
+    assert len(basket_inserts) == 2
+    assert not [s for s in recorded_statements if "FROM baskets" in s]
+
+    response = authorized_client.get("/basket/all")
+    assert [item["quantity"] for item in response.json()] == [5]
+
+
+def test_bulk_basket_update_applies_all_operations_or_none(
+    authorized_client: callable,
+    session: callable,
+    test_user: callable,
+    test_products: callable,
+) -> None:
+    """Tests bulk basket operations are applied in order, in a single transaction."""
+    first_product, second_product = test_products[0], test_products[1]
+    response = authorized_client.post(
+        f"/basket/{test_user['id']}/bulk",
+        json={
+            "operations": [
+                {"operation": "add", "product_id": first_product["id"], "quantity": 2},
+                {"operation": "add", "product_id": second_product["id"], "quantity": 3},
+                {"operation": "set", "product_id": first_product["id"], "quantity": 5},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert [(item["product_id"], item["quantity"]) for item in response.json()] == [
+        (first_product["id"], 5),
+        (second_product["id"], 3),
+    ]
+
+    response = authorized_client.post(
+        f"/basket/{test_user['id']}/bulk",
+        json={
+            "operations": [
+                {"operation": "remove", "product_id": second_product["id"]},
+                {
+                    "operation": "add",
+                    "product_id": first_product["id"],
+                    "quantity": 1000,
+                },
+            ]
+        },
+    )
+    assert response.status_code == 406
+
+    response = authorized_client.post(
+        f"/basket/{test_user['id']}/bulk",
+        json={
+            "operations": [{"operation": "remove", "product_id": second_product["id"]}]
+        },
+    )
+    assert response.status_code == 200
+    assert [(item["product_id"], item["quantity"]) for item in response.json()] == [
+        (first_product["id"], 5)
+    ]
+
+    session.expire_all()
+    stock = dict(session.query(Products.id, Products.stock).all())
+    assert stock[first_product["id"]] == first_product["stock"] - 5
+    assert stock[second_product["id"]] == second_product["stock"] - 3
+
+
+def test_basket_summary_follows_basket_and_price_changes(
+    authorized_client: callable,
+    admin_client: callable,
+    test_user: callable,
+    test_products: callable,
+) -> None:
+    """Tests the basket summary is kept up to date by basket and price changes."""
+
+    def get_summary() -> tuple[int, float]:
+        """Gets the item count and total cost from the test user's basket summary."""
+        response = authorized_client.get(f"/basket/{test_user['id']}/summary")
+        assert response.status_code == 200
+        return response.json()["total_items"], response.json()["total_cost"]
+
+    def get_basket_totals() -> tuple[int, float]:
+        """Gets the item count and total cost worked out from the basket items."""
+        basket = authorized_client.get(f"/basket/{test_user['id']}").json()
+        return basket["total_items_in_basket"], basket["total_cost_of_basket"]
+
+    first_product, second_product = test_products[1], test_products[2]
+    for product, quantity in [(first_product, 2), (second_product, 3)]:
+        authorized_client.post(
+            f"/basket/{test_user['id']}",
+            json={"product_id": product["id"], "quantity": quantity},
+        )
+    assert get_summary() == get_basket_totals()
+
+    admin_client.put(f"/product/price/{first_product['id']}", json={"new_price": 7.5})
+    admin_client.put(
+        f"/product/sale/{second_product['id']}", json={"sale_percentage": 5}
+    )
+    assert get_summary() == get_basket_totals()
+
+    authorized_client.request(
+        "DELETE",
+        f"/basket/{test_user['id']}",
+        json={"product_id": second_product["id"]},
+    )
+    assert get_summary() == get_basket_totals() == (2, 13.5)
+
+    authorized_client.post(
+        f"/payment/{test_user['id']}",
+        json={"payment_amount": 13.5, "coupons_to_use": 0},
+    )
+    assert get_summary() == (0, 0)
+
+
+def test_adding_a_hot_product_marks_the_basket_summary_stale(
+    authorized_client: callable,
+    session: callable,
+    test_user: callable,
+    test_products: callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests a hot product is added without locking its row or pricing the summary."""
+    product = test_products[3]
+    counter = ShardedStockCounter(
+        product_id=product["id"],
+        shard_count=2,
+        lease_size=10,
+        session_factory=TestingSessionLocal,
+    )
+    monkeypatch.setitem(hot_stock.counters, product["id"], counter)
+
+    response = authorized_client.post(
+        f"/basket/{test_user['id']}",
+        json={"product_id": product["id"], "quantity": 2},
+    )
+    assert response.status_code == 201
+    assert session.scalar(
+        select(BasketSummaries.is_stale).where(
+            BasketSummaries.user_id == test_user["id"]
+        )
+    )
+
+    response = authorized_client.get(f"/basket/{test_user['id']}/summary")
+    assert response.status_code == 200
+    assert (response.json()["total_items"], response.json()["total_cost"]) == (2, 206)
+    counter.flush()
@@ -0,0 +1,56 @@
+import time
+
+from src.cache.backends import LRUCache, RedisCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand in for a redis.Redis client."""
+
+    def __init__(self) -> None:
+        """Creates an empty fake Redis."""
+        self.values = {}
+
+    def get(self, key: str) -> bytes | None:
+        """Gets a value if it has not expired."""
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def set(self, key: str, value: str, px: int | None = None) -> None:
+        """Sets a value with an optional expiry in milliseconds."""
+        expires_at = None if px is None else time.monotonic() + px / 1000
+        self.values[key] = (value.encode(), expires_at)
+
+    def delete(self, *keys: str) -> None:
+        """Deletes values."""
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match: str) -> list[str]:
+        """Gets the keys starting with a prefix."""
+        return [key for key in list(self.values) if key.startswith(match[:-1])]
+
+
+def test_lru_cache_evicts_least_recently_used_and_expired_values() -> None:
+    """Tests the in-process cache is bounded in size and time."""
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    cache.set("d", 4, ttl_seconds=0)
+    assert cache.get("d") is None
+
+
+def test_redis_cache_round_trips_and_deletes_values() -> None:
+    """Tests the Redis cache stores JSON values and removes them on delete."""
+    cache = RedisCache(client=FakeRedis(), ttl_seconds=60)
+    cache.set("product:1", {"name": "Apple MacBook Pro M2", "price": 45000.5})
+    assert cache.get("product:1") == {"name": "Apple MacBook Pro M2", "price": 45000.5}
+
+    cache.delete("product:1")
+    assert cache.get("product:1") is None
@@ -0,0 +1,73 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+
+from src.database.database_connection import Base
+from src.database.migration import get_alembic_config, upgrade_database
+from tests.conftest import engine
+
+
+def drop_all_tables() -> None:
+    """Drops every table, including the alembic version table."""
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+def test_migrations_create_the_same_schema_as_the_models() -> None:
+    """Tests upgrading an empty database leaves nothing for autogenerate to add."""
+    drop_all_tables()
+    upgrade_database(connectable=engine)
+
+    with engine.connect() as connection:
+        differences = compare_metadata(
+            MigrationContext.configure(connection), Base.metadata
+        )
+
+    drop_all_tables()
+    assert differences == []
+
+
+def test_databases_created_before_migrations_are_upgraded_to_the_models() -> None:
+    """Tests tables created by create_all before migrations are stamped and upgraded."""
+    drop_all_tables()
+    config = get_alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0001")
+        connection.execute(text("DROP TABLE alembic_version"))
+
+    upgrade_database(connectable=engine)
+
+    with engine.connect() as connection:
+        differences = compare_metadata(
+            MigrationContext.configure(connection), Base.metadata
+        )
+
+    drop_all_tables()
+    assert differences == []
+
+
+def test_unique_basket_index_migration_merges_duplicate_items() -> None:
+    """Tests duplicate basket rows are merged before the unique index is added."""
+    drop_all_tables()
+    config = get_alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0001")
+        connection.execute(
+            text(
+                "INSERT INTO users (name, email, hashed_password) VALUES ('a', 'a', 'a');"
+                "INSERT INTO products (name, price, stock) VALUES ('p', 1, 10);"
+                "INSERT INTO baskets (user_id, product_id, quantity) "
+                "VALUES (1, 1, 2), (1, 1, 3)"
+            )
+        )
+        command.upgrade(config, "head")
+        basket_items = connection.execute(
+            text("SELECT user_id, product_id, quantity FROM baskets")
+        ).all()
+
+    drop_all_tables()
+    assert basket_items == [(1, 1, 5)]
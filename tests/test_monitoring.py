@@ -0,0 +1,121 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from main import app
+from src.database.models import Users
+from src.monitoring import profiling, queries
+from src.monitoring.metrics import clear_metrics, render_metrics
+from src.monitoring.middleware import MetricsMiddleware, RequestScopeMiddleware
+from src.monitoring.profiling import (
+    PROFILE_HEADER,
+    PROFILED_STATUS_HEADER,
+    ProfilingMiddleware,
+)
+from src.monitoring.queries import record_query_end, record_query_start
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def instrumented_engines(engine_listener: callable) -> None:
+    """Times the queries of both test engines for the duration of a test."""
+    engine_listener("before_cursor_execute", record_query_start)
+    engine_listener("after_cursor_execute", record_query_end)
+
+
+def test_get_connection_pool_metrics(client: callable) -> None:
+    """Tests the connection pool metrics are exposed for both engines."""
+    response = client.get("/health/pool")
+    assert response.status_code == 200
+    for pool_metrics in response.json().values():
+        assert {"size", "checked_out", "overflow", "wait_seconds_total"} <= set(
+            pool_metrics
+        )
+
+
+def test_request_metrics_are_recorded_by_route(
+    authorized_client: callable, test_user: callable, instrumented_engines: None
+) -> None:
+    """Tests request latencies and query counts are labelled with the route template."""
+    clear_metrics()
+    metrics_client = TestClient(
+        MetricsMiddleware(app), headers=authorized_client.headers
+    )
+
+    assert metrics_client.get(f"/user/{test_user['id']}").status_code == 200
+    assert metrics_client.get("/no/such/route").status_code == 404
+
+    metrics = render_metrics().splitlines()
+    route_label = 'method="GET",route="/user/{id}"'
+    unmatched_label = 'method="GET",route="unmatched"'
+    assert (
+        f'http_request_duration_seconds_count{{{route_label},status="200"}} 1'
+        in metrics
+    )
+    assert (
+        f'http_request_duration_seconds_count{{{unmatched_label},status="404"}} 1'
+        in metrics
+    )
+    assert f'http_request_db_queries_bucket{{{route_label},le="0.0"}} 0' in metrics
+    assert f'http_request_db_queries_bucket{{{unmatched_label},le="0.0"}} 1' in metrics
+
+
+def test_slow_queries_are_logged_with_their_route(
+    authorized_client: callable,
+    test_user: callable,
+    session: callable,
+    instrumented_engines: None,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Tests slow queries are logged with their route, but not their parameter values."""
+    monkeypatch.setattr(queries, "SLOW_QUERY_THRESHOLD_MS", 0)
+    scoped_client = TestClient(
+        RequestScopeMiddleware(app), headers=authorized_client.headers
+    )
+
+    with caplog.at_level(logging.WARNING, logger=queries.__name__):
+        assert scoped_client.get(f"/user/{test_user['id']}").status_code == 200
+        new_user = {"name": "Slow", "email": "slow@example.com", "password": "secret"}
+        assert scoped_client.post("/user/", json=new_user).status_code == 201
+
+    assert any(
+        "serving GET /user/{id}" in message and "FROM users" in message
+        for message in caplog.messages
+    )
+    assert any("INSERT INTO users" in message for message in caplog.messages)
+    hashed_password = session.scalar(
+        select(Users.hashed_password).where(Users.email == new_user["email"])
+    )
+    assert not any(
+        new_user["email"] in message or hashed_password in message
+        for message in caplog.messages
+    )
+
+
+def test_only_admins_can_profile_requests(
+    authorized_client: callable,
+    admin_client: callable,
+    test_user: callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests an admin's profiled request returns collapsed stacks instead of its body."""
+    monkeypatch.setattr(profiling, "SessionLocal", TestingSessionLocal)
+    profiled_path = f"/user/{test_user['id']}"
+    response = TestClient(ProfilingMiddleware(app)).get(
+        profiled_path,
+        headers={**authorized_client.headers, PROFILE_HEADER: "true"},
+    )
+    assert response.status_code == 403
+
+    response = TestClient(ProfilingMiddleware(app)).get(
+        profiled_path,
+        headers={**admin_client.headers, PROFILE_HEADER: "true"},
+    )
+    assert response.status_code == 200
+    assert response.headers[PROFILED_STATUS_HEADER] == "200"
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.split(";")[0] and int(count) > 0
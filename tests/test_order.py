@@ -0,0 +1,53 @@
+def pay_for_products(
+    authorized_client: callable, user_id: int, products: list[dict]
+) -> None:
+    """Adds one of each product to a user's basket and pays for it."""
+    for product in products:
+        authorized_client.post(
+            f"/basket/{user_id}", json={"product_id": product["id"], "quantity": 1}
+        )
+    basket = authorized_client.get(f"/basket/{user_id}").json()
+    response = authorized_client.post(
+        f"/payment/{user_id}",
+        json={"payment_amount": basket["total_cost_of_basket"], "coupons_to_use": 0},
+    )
+    assert response.status_code == 200
+
+
+def test_checkout_writes_an_order(
+    authorized_client: callable, test_user: callable, test_products: callable
+) -> None:
+    """Tests paying for a basket records an order with a line per basket item."""
+    pay_for_products(authorized_client, test_user["id"], test_products[:2])
+
+    response = authorized_client.get("/orders")
+    assert response.status_code == 200
+    orders = response.json()
+    assert len(orders) == 1
+    assert [line["product_id"] for line in orders[0]["lines"]] == [
+        product["id"] for product in test_products[:2]
+    ]
+    assert orders[0]["total_cost"] == sum(
+        line["total_cost"] for line in orders[0]["lines"]
+    )
+
+
+def test_get_orders_pages_newest_first(
+    authorized_client: callable, test_user: callable, test_products: callable
+) -> None:
+    """Tests orders are paged newest first by following the next cursor."""
+    for product in test_products[:3]:
+        pay_for_products(authorized_client, test_user["id"], [product])
+
+    product_ids = []
+    after = None
+    while True:
+        params = {"limit": 2} if after is None else {"limit": 2, "after": after}
+        response = authorized_client.get("/orders", params=params)
+        assert response.status_code == 200
+        product_ids += [order["lines"][0]["product_id"] for order in response.json()]
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+
+    assert product_ids == [product["id"] for product in reversed(test_products[:3])]
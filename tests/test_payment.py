@@ -0,0 +1,99 @@
+from src.database.models import Products
+
+
+def test_pay_for_basket(
+    authorized_client: callable, test_user: callable, test_products: callable
+) -> None:
+    """Tests a user can pay the exact cost of their basket."""
+    for product in test_products[:3]:
+        authorized_client.post(
+            f"/basket/{test_user['id']}",
+            json={"product_id": product["id"], "quantity": 2},
+        )
+    basket = authorized_client.get(f"/basket/{test_user['id']}").json()
+
+    response = authorized_client.post(
+        f"/payment/{test_user['id']}",
+        json={"payment_amount": basket["total_cost_of_basket"], "coupons_to_use": 0},
+    )
+    assert response.status_code == 200
+    assert response.json()["total_spent_overall"] == basket["total_cost_of_basket"]
+    assert response.json()["basket_items"] == []
+
+
+def test_pay_with_too_many_coupons_keeps_basket(
+    authorized_client: callable, test_user: callable, test_products: callable
+) -> None:
+    """Tests paying with coupons a user does not have changes nothing."""
+    authorized_client.post(
+        f"/basket/{test_user['id']}",
+        json={"product_id": test_products[0]["id"], "quantity": 1},
+    )
+    basket = authorized_client.get(f"/basket/{test_user['id']}").json()
+
+    response = authorized_client.post(
+        f"/payment/{test_user['id']}",
+        json={"payment_amount": basket["total_cost_of_basket"], "coupons_to_use": 1},
+    )
+    assert response.status_code == 405
+
+    user = authorized_client.get(f"/user/{test_user['id']}").json()
+    assert user["total_spent_overall"] == 0
+    assert len(user["basket_items"]) == 1
+
+
+def test_retrying_a_payment_with_an_idempotency_key_charges_once(
+    authorized_client: callable, test_user: callable, test_products: callable
+) -> None:
+    """Tests a retried payment gets the first response back without paying again."""
+    authorized_client.post(
+        f"/basket/{test_user['id']}",
+        json={"product_id": test_products[0]["id"], "quantity": 1},
+    )
+    basket = authorized_client.get(f"/basket/{test_user['id']}").json()
+    payment = {"payment_amount": basket["total_cost_of_basket"], "coupons_to_use": 0}
+
+    responses = [
+        authorized_client.post(
+            f"/payment/{test_user['id']}",
+            json=payment,
+            headers={"Idempotency-Key": "checkout-1"},
+        )
+        for _ in range(2)
+    ]
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].json() == responses[1].json()
+
+    user = authorized_client.get(f"/user/{test_user['id']}").json()
+    assert user["total_spent_overall"] == basket["total_cost_of_basket"]
+
+    response = authorized_client.post(
+        f"/payment/{test_user['id']}",
+        json={**payment, "payment_amount": 1},
+        headers={"Idempotency-Key": "checkout-1"},
+    )
+    assert response.status_code == 422
+
+
+def test_pay_for_basket_with_cent_prices(
+    authorized_client: callable, session: callable, test_user: callable
+) -> None:
+    """Tests paying exactly for prices that do not add up exactly as floats."""
+    products = [
+        Products(name="Pen", price=0.1, stock=5),
+        Products(name="Pad", price=0.2, stock=5),
+    ]
+    session.add_all(products)
+    session.commit()
+    product_ids = [product.id for product in products]
+    for product_id in product_ids:
+        authorized_client.post(
+            f"/basket/{test_user['id']}", json={"product_id": product_id, "quantity": 1}
+        )
+
+    response = authorized_client.post(
+        f"/payment/{test_user['id']}",
+        json={"payment_amount": 0.3, "coupons_to_use": 0},
+    )
+    assert response.status_code == 200
+    assert response.json()["total_spent_overall"] == 0.3
@@ -1,4 +1,220 @@
+import base64
+import csv
+import io
+import json
+
+import pytest
+
+from src.database.models import Products
+from src.database.money import round_money
+
+
 def test_get_all_products(authorized_client: callable) -> None:
     """Tests the route to get all products."""
     response = authorized_client.get("/product/all")
     assert response.status_code == 200
+
+
+def test_unique_product_cache_is_invalidated_by_price_update(
+    authorized_client: callable,
+    admin_client: callable,
+    session: callable,
+    test_products: callable,
+) -> None:
+    """Tests a cached product is served until an admin changes its price."""
+    product = test_products[0]
+    response = authorized_client.get(f"/product/{product['id']}")
+    assert response.json()["price"] == product["price"]
+
+    session.query(Products).filter(Products.id == product["id"]).update({"price": 1})
+    session.commit()
+    response = authorized_client.get(f"/product/{product['id']}")
+    assert response.json()["price"] == product["price"]
+
+    response = admin_client.put(
+        f"/product/price/{product['id']}", json={"new_price": 2}
+    )
+    assert response.status_code == 200
+    response = authorized_client.get(f"/product/{product['id']}")
+    assert response.json()["price"] == 2
+
+
+def test_get_all_products_pages_through_catalogue(
+    authorized_client: callable, test_products: callable
+) -> None:
+    """Tests following the next page cursor visits every product once, in order."""
+    product_names = []
+    query_parameters = {"limit": 7, "sort_by": "price", "descending": True}
+
+    while True:
+        response = authorized_client.get("/product/all", params=query_parameters)
+        assert response.status_code == 200
+        product_names += [product["name"] for product in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        query_parameters["after"] = response.headers["X-Next-Cursor"]
+
+    assert product_names == [
+        product["name"]
+        for product in sorted(test_products, key=lambda product: -product["price"])
+    ]
+
+
+def test_effective_price_follows_sale_and_sorts_catalogue(
+    authorized_client: callable, admin_client: callable, test_products: callable
+) -> None:
+    """Tests the sale price is kept current and the catalogue can be sorted by it."""
+    product = test_products[0]
+    response = admin_client.put(
+        f"/product/sale/{product['id']}", json={"sale_percentage": 15}
+    )
+    assert response.status_code == 200
+    assert response.json()["effective_price"] == float(
+        round_money(product["price"] * 85 / 100)
+    )
+
+    response = authorized_client.get(
+        "/product/all", params={"sort_by": "effective_price", "limit": 1000}
+    )
+    effective_prices = [product["effective_price"] for product in response.json()]
+    assert len(effective_prices) == len(test_products)
+    assert effective_prices == sorted(effective_prices)
+
+
+def test_get_all_products_filters_catalogue(
+    authorized_client: callable, test_products: callable
+) -> None:
+    """Tests the catalogue can be filtered by price and sale."""
+    response = authorized_client.get(
+        "/product/all", params={"on_sale": True, "min_price": 105, "max_price": 115}
+    )
+    assert [product["name"] for product in response.json()] == [
+        product["name"]
+        for product in test_products
+        if product["sale_percentage"] > 0 and 105 <= product["price"] <= 115
+    ]
+
+
+def test_export_all_products_streams_ndjson_and_csv(
+    authorized_client: callable, test_products: callable
+) -> None:
+    """Tests the catalogue export writes every product as NDJSON or CSV."""
+    response = authorized_client.get("/product/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported_products = [json.loads(line) for line in response.text.splitlines()]
+    assert exported_products == [
+        {**product, "price": str(product["price"])}
+        for product in sorted(test_products, key=lambda product: product["id"])
+    ]
+    assert exported_products[0]["price"] == "100.00"
+
+    response = authorized_client.get("/product/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == [
+        product["name"] for product in exported_products
+    ]
+
+
+def test_bulk_product_import_reports_failed_rows(
+    admin_client: callable, test_products: callable
+) -> None:
+    """Tests a bulk import creates valid products and reports the rows it skipped."""
+    response = admin_client.post(
+        "/product/bulk",
+        json=[
+            {"name": "New Product", "price": 10, "stock": 5},
+            {"name": test_products[0]["name"], "price": 10, "stock": 5},
+            {"name": "Bad Product", "price": "free", "stock": 5},
+            {"name": "New Product", "price": 20, "stock": 5},
+        ],
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+
+    response = admin_client.get("/product/all", params={"limit": 1000})
+    assert "New Product" in [product["name"] for product in response.json()]
+
+
+def test_bulk_price_update_from_csv(
+    admin_client: callable, test_products: callable
+) -> None:
+    """Tests product prices can be updated from a CSV upload."""
+    admin_client.get(f"/product/{test_products[0]['id']}")
+    response = admin_client.put(
+        "/product/bulk/price",
+        content=f"id,new_price\n{test_products[0]['id']},1.5\n999999,2\n",
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "succeeded": 1,
+        "errors": [{"row": 2, "detail": "product does not exist"}],
+    }
+
+    response = admin_client.get(f"/product/{test_products[0]['id']}")
+    assert response.json()["price"] == 1.5
+
+
+@pytest.mark.parametrize("new_price", [-1, 10**10, "9999999999.995", "NaN"])
+def test_price_update_rejects_amounts_the_column_cannot_store(
+    admin_client: callable, test_products: callable, new_price: object
+) -> None:
+    """Tests a price that is negative, too large or not finite is a 422, not a 500."""
+    response = admin_client.put(
+        f"/product/price/{test_products[0]['id']}", json={"new_price": new_price}
+    )
+    assert response.status_code == 422
+
+    response = admin_client.get(f"/product/{test_products[0]['id']}")
+    assert response.json()["price"] == test_products[0]["price"]
+
+
+def test_bulk_price_update_reports_amounts_the_column_cannot_store(
+    admin_client: callable, test_products: callable
+) -> None:
+    """Tests out of range prices in a bulk update are reported as invalid rows."""
+    response = admin_client.put(
+        "/product/bulk/price",
+        json=[
+            {"id": test_products[0]["id"], "new_price": 10**10},
+            {"id": test_products[1]["id"], "new_price": -5},
+            {"id": test_products[2]["id"], "new_price": 7},
+        ],
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 1
+    assert [error["row"] for error in result["errors"]] == [1, 2]
+    assert all("amount of money" in error["detail"] for error in result["errors"])
+
+
+@pytest.mark.parametrize(
+    "sort_by, cursor_values",
+    [
+        ("id", ["abc"]),
+        ("id", [True]),
+        ("name", [{"name": "Product 1"}, 1]),
+        ("name", [["Product 1"], 1]),
+        ("price", [100, 1]),
+        ("price", ["NaN", 1]),
+        ("effective_price", ["cheap", 1]),
+        ("effective_price", [None, 1]),
+        ("stock", ["50", 1]),
+        ("stock", [50, "1"]),
+    ],
+)
+def test_get_all_products_rejects_malformed_cursors(
+    authorized_client: callable, sort_by: str, cursor_values: list
+) -> None:
+    """Tests a cursor with values of the wrong type for its sort key is a 400."""
+    cursor = base64.urlsafe_b64encode(json.dumps(cursor_values).encode()).decode()
+    response = authorized_client.get(
+        "/product/all", params={"sort_by": sort_by, "after": cursor}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "invalid pagination cursor"}
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.database.models import Products
+from src.repository.product import reserve_product_stock
+from src.repository.stock_shards import ShardedStockCounter
+from tests.conftest import TestingSessionLocal
+
+
+def test_concurrent_stock_reservations_never_oversell(
+    session: callable, test_products: callable
+) -> None:
+    """Tests many threads reserving the same product can only take the stock there is."""
+    product = test_products[0]
+
+    def reserve(_: int) -> bool:
+        """Reserves some stock of the product in its own session."""
+        db = TestingSessionLocal()
+        try:
+            reserve_product_stock(db=db, product_id=product["id"], quantity=3)
+            db.commit()
+            return True
+        except HTTPException:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        reservations = list(executor.map(reserve, range(40)))
+
+    remaining_stock = session.scalar(
+        select(Products.stock).where(Products.id == product["id"])
+    )
+    assert reservations.count(True) == product["stock"] // 3
+    assert remaining_stock == product["stock"] % 3
+
+
+def test_sharded_stock_counter_never_oversells(
+    session: callable, test_products: callable
+) -> None:
+    """Tests a hot product's sharded stock only hands out the stock there is."""
+    product = test_products[0]
+    counter = ShardedStockCounter(
+        product_id=product["id"],
+        shard_count=4,
+        lease_size=8,
+        session_factory=TestingSessionLocal,
+    )
+
+    def reserve(_: int) -> bool:
+        """Reserves some stock of the product from its sharded counter."""
+        try:
+            counter.reserve(quantity=3)
+            return True
+        except HTTPException:
+            return False
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        reservations = list(executor.map(reserve, range(40)))
+    counter.flush()
+
+    remaining_stock = session.scalar(
+        select(Products.stock).where(Products.id == product["id"])
+    )
+    assert reservations.count(True) == product["stock"] // 3
+    assert remaining_stock == product["stock"] % 3
@@ -17,3 +17,15 @@ def test_create_new_user(client: callable) -> None:
     assert new_user.total_spent_overall == 0
     assert new_user.coupon_count == 0
     assert response.status_code == 201
+
+
+def test_deleted_user_token_is_rejected(
+    authorized_client: callable, test_user: callable
+) -> None:
+    """Tests a user's token stops working once the user has been deleted."""
+    assert authorized_client.get("/basket/all").status_code == 200
+
+    response = authorized_client.delete(f"/user/{test_user['id']}")
+    assert response.status_code == 204
+
+    assert authorized_client.get("/basket/all").status_code == 401